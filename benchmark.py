@@ -0,0 +1,320 @@
+"""
+Headless filter-to-render benchmark for the dashboard views.
+
+Drives ChartView (combined and split), TableView, GalleryView and ExplorerView through
+scripted filter states at several data sizes and times each stage:
+
+    filter     index.filter() of the current selection
+    convert    the view's data preparation (chart arrays, table frame, pandas frame)
+    build      the HoloViews / Panel objects
+    render     the Bokeh models (Panel get_root)
+    serialize  the Bokeh document JSON, as sent to the browser
+
+plus the size of the document and of the patch sent for one follow-up filter change.
+
+Usage:
+    python benchmark.py --sizes 25 109 --out results.json
+    python benchmark.py --out new.json --baseline results.json   # exits 1 on regressions
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import bokeh
+import holoviews as hv
+import panel as pn
+import polars as pl
+from bokeh.core.json_encoder import serialize_json
+from bokeh.document import Document
+from bokeh.document.events import DocumentPatchedEvent
+from bokeh.protocol import Protocol
+
+from filter_chart import (
+    ChartView, ExplorerView, FilteredData, FilterSelectors, GalleryView, PartitionIndex,
+    RollupCube, TableView, generate_full_df,
+)
+from view_cache import ViewCache
+
+STAGES = ["filter", "convert", "build", "render", "serialize"]
+
+SCENARIOS = ["single_series", "one_region", "all_series"]
+
+DATE_RANGES = {
+    "short": 30,   # last N days
+    "full": None,
+}
+
+# Stage timings below this many ms are noise, never regressions
+MIN_REGRESSION_MS = 5.0
+
+
+###############################
+# 1) Scripted filter states
+###############################
+def apply_scenario(selectors, index, scenario, date_range):
+    """Drive the selectors like a user would, top to bottom, then set the dates."""
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Unknown scenario: {scenario!r}")
+
+    for selector in (selectors.region_selector, selectors.C_selector,
+                     selectors.D_selector, selectors.A_selector):
+        options = list(selector.options)
+        if scenario == "single_series" or (scenario == "one_region" and selector is selectors.region_selector):
+            options = options[:1]
+        selector.value = options
+
+    start, end = (dt.date() for dt in index.date_range())
+    days = DATE_RANGES[date_range]
+    if days is not None:
+        start = end - timedelta(days=days)
+    selectors.date_range_picker.value = (start, end)
+
+
+###############################
+# 2) Per-view stages
+###############################
+def view_stages(name, view, filtered_data):
+    """
+    (convert, build, update) for a view: convert prepares its data, build(data) puts the
+    result in the view and returns it, update() is the view's refresh after a filter change.
+    """
+    if name in ("chart", "chart_split"):
+        def build_chart(chart_data):
+            view.view[-1] = view.create_plot_view(chart_data)
+            return view.view
+        def convert_chart():
+            return view._build_chart_data(*view.chart_state())
+        return convert_chart, build_chart, view.update_charts
+    if name == "table":
+        def build_table(frame):
+            view.show_first_page(frame)
+            return view.view
+        def convert_table():
+            return view._build_table_frame(filtered_data.filters(), view.table_options())
+        return convert_table, build_table, view.update_table
+    if name == "gallery":
+        def build_gallery(_):
+            view.show_gallery(view.build_gallery())
+            return view.view
+        convert = filtered_data.compact_pandas if view.compact_wire else filtered_data.pandas
+        return convert, build_gallery, view.update_gallery
+    if name == "explorer":
+        def build_explorer(_):
+            view.show_explorer(view.build_explorer())
+            return view.view
+        return filtered_data.pandas, build_explorer, view.update_explorer
+    raise ValueError(f"Unknown view: {name!r}")
+
+
+VIEWS = {
+    "chart": ChartView,
+    "chart_split": ChartView,  # one figure per series (split charts)
+    "table": TableView,
+    "gallery": GalleryView,
+    "explorer": ExplorerView,
+}
+
+# Views that support the compact wire encoding
+COMPACT_VIEWS = {"chart", "chart_split", "gallery"}
+
+WIRE_MODES = {
+    "default": [False],
+    "compact": [True],
+    "both": [False, True],
+}
+
+# The scripted update after the first render moves the date range back by this many days
+UPDATE_SHIFT_DAYS = 7
+
+
+def message_bytes(message):
+    """Size of a Bokeh protocol message on the websocket, binary buffers included."""
+    sent = len(message.header_json) + len(message.metadata_json) + len(message.content_json)
+    return sent + sum(len(buffer.to_bytes()) for buffer in message.buffers)
+
+
+def run_once(name, index, rollups, scenario, date_range, compact_wire=False):
+    """
+    Time every stage of one filter-to-render pass with cold caches, then measure the
+    document patch sent for one follow-up filter change.
+    """
+    # The view exists before the filters change, as in the app
+    selectors = FilterSelectors(index)
+    filtered_data = FilteredData(index, selectors, ViewCache(), ViewCache(), rollups=rollups)
+    options = {"compact_wire": compact_wire} if name in COMPACT_VIEWS else {}
+    view = VIEWS[name](filtered_data, selectors, **options)
+    if name == "chart_split":
+        view.split_charts_checkbox.value = True
+    apply_scenario(selectors, index, scenario, date_range)
+    convert, build, update = view_stages(name, view, filtered_data)
+
+    timings = {}
+
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        timings[stage] = (time.perf_counter() - start) * 1000
+        return result
+
+    frame = timed("filter", filtered_data.frame)
+    data = timed("convert", convert)
+    viewable = timed("build", build, data)
+
+    doc = Document()
+    root = timed("render", pn.panel(viewable).get_root, doc)
+    doc.add_root(root)
+    payload = timed("serialize", lambda: serialize_json(doc.to_json(deferred=False)))
+
+    # Panel drops the events of documents without a connected session (they are sent in
+    # full on connect), so mark this one connected to see the patch a browser would get
+    pn.state._connected[doc] = True
+    events = []
+    doc.on_change(lambda event: isinstance(event, DocumentPatchedEvent) and events.append(event))
+    start, end = selectors.date_range_picker.value
+    shift = timedelta(days=UPDATE_SHIFT_DAYS)
+    selectors.date_range_picker.value = (start - shift, end - shift)
+    update()
+    doc.unhold()  # release events Panel held for the (absent) event loop
+    update_bytes = message_bytes(Protocol().create("PATCH-DOC", events)) if events else 0
+
+    return timings, len(frame), len(payload), update_bytes
+
+
+def benchmark(sizes, days, views, scenarios, date_ranges, repeat, warmup=1, wire="default"):
+    results = []
+    for size in sizes:
+        index = PartitionIndex(generate_full_df(num_series=size, days=days))
+        rollups = RollupCube(index)
+        for name in views:
+            for compact_wire in WIRE_MODES[wire]:
+                if compact_wire and name not in COMPACT_VIEWS:
+                    continue
+                for scenario in scenarios:
+                    for date_range in date_ranges:
+                        # Warm-up runs pay for imports and first-use setup and aren't recorded
+                        runs = [
+                            run_once(name, index, rollups, scenario, date_range, compact_wire)
+                            for _ in range(warmup + repeat)
+                        ][warmup:]
+                        stages = {
+                            stage: round(statistics.median(run[0][stage] for run in runs), 3)
+                            for stage in STAGES
+                        }
+                        stages["total"] = round(sum(stages.values()), 3)
+                        result = {
+                            "view": name,
+                            "size": size,
+                            "scenario": scenario,
+                            "date_range": date_range,
+                            "wire": "compact" if compact_wire else "default",
+                            "rows": runs[0][1],
+                            "document_bytes": runs[0][2],
+                            "update_bytes": runs[0][3],
+                            "stages_ms": stages,
+                        }
+                        results.append(result)
+                        print(
+                            f"{name:<9} {result['wire']:<8} {size:>5} series  {scenario:<14} {date_range:<6}"
+                            f"{result['rows']:>10,} rows  total {stages['total']:>9.1f} ms  "
+                            + "  ".join(f"{stage} {stages[stage]:.1f}" for stage in STAGES)
+                            + f"  update {result['update_bytes']:,} B"
+                        )
+    return results
+
+
+def wire_report(results):
+    """Document and per-update bytes of the default vs. compact encoding, side by side."""
+    by_key = {(result_key(result)[:-1], result["wire"]): result for result in results}
+    for (key, wire), compact in by_key.items():
+        default = by_key.get((key, "default"))
+        if wire != "compact" or default is None:
+            continue
+        print(
+            f"WIRE {' / '.join(map(str, key))}: document {default['document_bytes']:,} -> "
+            f"{compact['document_bytes']:,} B, update {default['update_bytes']:,} -> "
+            f"{compact['update_bytes']:,} B"
+        )
+
+
+###############################
+# 3) Baseline comparison
+###############################
+def result_key(result):
+    return result["view"], result["size"], result["scenario"], result["date_range"], result.get("wire", "default")
+
+
+def compare(results, baseline, tolerance):
+    """Stage timings more than `tolerance` (fraction) and MIN_REGRESSION_MS slower than the baseline."""
+    previous = {result_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        for stage, new_ms in result["stages_ms"].items():
+            old_ms = old["stages_ms"].get(stage)
+            if old_ms is None:
+                continue
+            if new_ms > old_ms * (1 + tolerance) and new_ms - old_ms > MIN_REGRESSION_MS:
+                regressions.append((result_key(result), stage, old_ms, new_ms))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless filter-to-render benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 109],
+                        help="Dataset sizes, in number of series")
+    parser.add_argument("--days", type=int, default=365*5, help="Days of data per series")
+    parser.add_argument("--views", nargs="+", choices=list(VIEWS), default=list(VIEWS))
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--date-ranges", nargs="+", choices=list(DATE_RANGES), default=list(DATE_RANGES))
+    parser.add_argument("--wire", choices=list(WIRE_MODES), default="default",
+                        help="Chart/Gallery wire encoding; 'both' also prints a bytes report")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the median is reported")
+    parser.add_argument("--warmup", type=int, default=1, help="Unrecorded runs per case")
+    parser.add_argument("--out", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline, as a fraction")
+    args = parser.parse_args()
+
+    results = benchmark(args.sizes, args.days, args.views, args.scenarios, args.date_ranges,
+                        args.repeat, args.warmup, args.wire)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "polars": pl.__version__,
+            "panel": pn.__version__,
+            "holoviews": hv.__version__,
+            "bokeh": bokeh.__version__,
+            "days": args.days,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.out}")
+    if args.wire == "both":
+        wire_report(results)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for key, stage, old_ms, new_ms in regressions:
+            print(f"REGRESSION {' / '.join(map(str, key))} {stage}: {old_ms:.1f} -> {new_ms:.1f} ms")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
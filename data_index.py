@@ -0,0 +1,281 @@
+import threading
+from datetime import date, datetime, time
+
+import numpy as np
+import polars as pl
+
+KEY_COLUMNS = ["region", "C", "D", "A"]
+
+# Appends after which PartitionIndex rewrites its frame as one chunk per column
+MAX_APPENDED_CHUNKS = 64
+
+
+###############################
+# 1) Hierarchy index
+###############################
+class HierarchyIndex:
+    """
+    Nested lookup of the distinct (region, C, D, A) combinations.
+
+    The selector cascades only depend on these few combinations, so the
+    options for the next MultiChoice are dictionary lookups, independent
+    of the row count.
+    """
+    def __init__(self, keys):
+        self.tree = {}
+        for key in keys:
+            self.add(key)
+
+    def add(self, key):
+        node = self.tree
+        for value in key:
+            node = node.setdefault(value, {})
+
+    def options(self, column, filters):
+        """Sorted values of `column` reachable from the selections above it (empty = all)."""
+        nodes = [self.tree]
+        for col in KEY_COLUMNS[:KEY_COLUMNS.index(column)]:
+            selected = filters.get(col)
+            nodes = [
+                child for node in nodes for value, child in node.items()
+                if not selected or value in selected
+            ]
+        return sorted({value for node in nodes for value in node})
+
+
+###############################
+# 2) Partition index
+###############################
+def search_dates(dates, value, side):
+    """search_sorted of one datetime in a date column, on its NumPy view (no per-call Series)."""
+    return np.searchsorted(dates.to_numpy(), np.datetime64(value, "us"), side=side)
+
+
+def as_datetime(value):
+    """Dates (e.g. from the date picker) as midnight datetimes, comparable with the date column."""
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time())
+    return value
+
+
+def series_runs(frame, offset=0):
+    """(key, start, end) of every run of rows sharing a (region, C, D, A) key, in frame order."""
+    new_run = pl.any_horizontal([pl.col(col).ne_missing(pl.col(col).shift()) for col in KEY_COLUMNS])
+    runs = frame.select(KEY_COLUMNS).with_row_index("start").filter(new_run)
+    ends = runs["start"].to_list()[1:] + [frame.height]
+    return [
+        (tuple(key), offset + start, offset + end)
+        for (start, *key), end in zip(runs.iter_rows(), ends)
+    ]
+
+
+class PartitionIndex:
+    """
+    Load-time index of the frame by series.
+
+    Every (region, C, D, A) series is stored as contiguous, date-sorted
+    runs of rows: one at load time, plus one per append(). Filtering picks
+    the runs for the selected keys and binary-searches the date range inside
+    each run, so the cost depends on the size of the selection rather than
+    the size of the dataset.
+
+    Pass `presorted=True` when the frame already has that layout (e.g. a
+    memory-mapped file written by write_generated_dataset) to index it in
+    place instead of sorting a copy.
+    """
+    def __init__(self, df, presorted=False):
+        df = df if presorted else df.sort(KEY_COLUMNS + ["date"])
+
+        runs = series_runs(df)
+        partitions = {key: [(start, end)] for key, start, end in runs}
+        if len(partitions) != len(runs):
+            raise ValueError("presorted frame is not contiguous per series")
+
+        # The frame and its runs are swapped together, under the lock, by append()
+        # and compact(), while view builds keep filtering on other threads
+        self._lock = threading.Lock()
+        self.df = df
+        self.partitions = partitions
+        self.hierarchy = HierarchyIndex(partitions)
+        self.versions = {}  # series key -> number of appends that changed it
+        self._appended_chunks = 0
+
+    def date_range(self):
+        return self.df["date"].min(), self.df["date"].max()
+
+    def keys(self):
+        return list(self.partitions)
+
+    def lazy(self):
+        """The frame, sorted by series and date, as a LazyFrame."""
+        return pl.concat([self.df.slice(lo, hi - lo) for lo, hi in self._ordered_runs()]).lazy()
+
+    def _ordered_runs(self):
+        return [run for key in sorted(self.partitions) for run in self.partitions[key]]
+
+    def select_keys(self, filters):
+        """Return the series keys matching the region/C/D/A part of the filters."""
+        return [key for key in self.partitions if self._matches(key, filters)]
+
+    @staticmethod
+    def _matches(key, filters):
+        return all(not filters[col] or value in filters[col] for col, value in zip(KEY_COLUMNS, key))
+
+    def version(self, filters):
+        """The append versions of the series matching the filters, for cache keys."""
+        return tuple(sorted(
+            (key, version) for key, version in self.versions.items() if self._matches(key, filters)
+        ))
+
+    @staticmethod
+    def date_bounds(df, start, end, date_start=None, date_end=None):
+        """Binary-search [date_start, date_end] (None = unbounded) inside the rows [start, end) of `df`."""
+        dates = df["date"].slice(start, end - start)
+        first, last = dates[0], dates[-1]
+        date_start, date_end = as_datetime(date_start), as_datetime(date_end)
+
+        # Checking the run's first and last dates settles most runs (and every short,
+        # appended one) without a search
+        lo, hi = start, end
+        if date_start is not None and first < date_start:
+            lo = end if last < date_start else start + search_dates(dates, date_start, "left")
+        if date_end is not None and last > date_end:
+            hi = start if first > date_end else start + search_dates(dates, date_end, "right")
+        return int(lo), int(hi)
+
+    def series_slices(self, key, date_start=None, date_end=None):
+        """The rows of one series dated within [date_start, date_end], as frame slices."""
+        with self._lock:
+            df, runs = self.df, self.partitions.get(key, [])
+        slices = []
+        # Newest run first: once a run starts before date_start, the earlier ones can't match
+        for lo, hi in reversed(runs):
+            start = lo
+            lo, hi = self.date_bounds(df, lo, hi, date_start, date_end)
+            if hi > lo:
+                slices.append(df.slice(lo, hi - lo))
+            if date_start is not None and lo > start:
+                break
+        return slices[::-1]
+
+    def filter(self, filters):
+        date_start, date_end = filters['date_range'] or (None, None)
+        if not (date_start and date_end):
+            date_start = date_end = None
+
+        slices = [
+            part
+            for key in self.select_keys(filters)
+            for part in self.series_slices(key, date_start, date_end)
+        ]
+        if not slices:
+            return self.df.clear()
+        return pl.concat(slices)
+
+    def append(self, rows, cumulative=(), replace=None):
+        """
+        Append `rows`, dated after the existing rows of their series (new series are allowed).
+
+        `cumulative` columns of `rows` hold per-day increments; they are cumulated per
+        series starting from its running total, the value in its last stored row. The
+        rows are added to the frame as a new chunk and indexed as one new run per
+        series, so the cost depends on the number of new rows, not on the history.
+        `replace` ({series key: from_date}) drops the rows of those series dated `from_date` or
+        later in the same swap (see truncate), so readers never see them half replaced;
+        their new rows must then start on or after `from_date`.
+        Returns {series key: first appended date}. Appends are expected from one writer.
+        """
+        replace = replace or {}
+        if replace and cumulative:
+            raise ValueError("replace and cumulative can't be combined")
+        rows = rows.select(self.df.columns).cast(self.df.schema).sort(KEY_COLUMNS + ["date"])
+        if rows.is_empty() and not replace:
+            return {}
+
+        firsts = rows.group_by(KEY_COLUMNS, maintain_order=True).agg(pl.col("date").first())
+        changed = {tuple(key): first_date for *key, first_date in firsts.iter_rows()}
+        last_rows = {key: self.last_row(key) for key in changed if key not in replace}
+        for key, first_date in changed.items():
+            if key in replace:
+                if first_date < replace[key]:
+                    raise ValueError(f"replacing rows for {key} must be dated from {replace[key]}")
+                continue
+            last = last_rows[key]
+            if last is not None and first_date <= last["date"]:
+                raise ValueError(f"appended rows for {key} must be dated after {last['date']}")
+
+        if cumulative:
+            totals = pl.DataFrame(
+                [
+                    (*key, *(0.0 if last is None else last[col] for col in cumulative))
+                    for key, last in last_rows.items()
+                ],
+                schema=KEY_COLUMNS + [f"{col}_total" for col in cumulative],
+                orient="row",
+            )
+            rows = rows.join(totals, on=KEY_COLUMNS, how="left").with_columns([
+                (pl.col(col).cum_sum().over(KEY_COLUMNS) + pl.col(f"{col}_total")).cast(self.df.schema[col])
+                for col in cumulative
+            ]).select(self.df.columns)
+
+        with self._lock:
+            start = self.df.height
+            # No rechunk: the existing chunks (and memory-mapped pages) stay as they are
+            df = self.df.vstack(rows)
+            partitions, versions = dict(self.partitions), dict(self.versions)
+            for key, from_date in replace.items():
+                partitions[key] = self._truncated_runs(self.df, partitions.get(key, []), from_date)
+                if key not in changed:
+                    versions[key] = versions.get(key, 0) + 1
+            for key, lo, hi in series_runs(rows, offset=start):
+                if key not in partitions:
+                    self.hierarchy.add(key)
+                partitions[key] = partitions.get(key, []) + [(lo, hi)]
+                versions[key] = versions.get(key, 0) + 1
+            self.df, self.partitions, self.versions = df, partitions, versions
+            self._appended_chunks += 1
+
+        if self._appended_chunks > MAX_APPENDED_CHUNKS:
+            self.compact()
+        return changed
+
+    def appended_rows(self, changed):
+        """The stored rows of an append, from its {series key: first appended date} result."""
+        return pl.concat([part for key, first_date in changed.items() for part in self.series_slices(key, first_date)])
+
+    def last_row(self, key):
+        """The last stored row of a series as a dict (None for a new series)."""
+        with self._lock:
+            df, runs = self.df, self.partitions.get(key, [])
+        if not runs:
+            return None
+        return df.row(runs[-1][1] - 1, named=True)
+
+    def truncate(self, key, from_date):
+        """Drop the rows of series `key` dated `from_date` or later from the index (not from the frame)."""
+        with self._lock:
+            runs = self._truncated_runs(self.df, self.partitions.get(key, []), from_date)
+            self.partitions = {**self.partitions, key: runs}
+
+    @staticmethod
+    def _truncated_runs(df, runs, from_date):
+        kept = []
+        for lo, hi in runs:
+            dates = df["date"].slice(lo, hi - lo)
+            if dates[0] >= from_date:
+                break  # this run and every later one start on or after `from_date`
+            if dates[-1] >= from_date:
+                hi = lo + int(search_dates(dates, from_date, "left"))
+            kept.append((lo, hi))
+        return kept
+
+    def compact(self):
+        """Rewrite the frame as one date-sorted run per series, dropping truncated rows."""
+        with self._lock:
+            runs = self._ordered_runs()
+            df = pl.concat([self.df.slice(lo, hi - lo) for lo, hi in runs], rechunk=True)
+            # Series truncated to nothing keep their (empty) entry
+            partitions = {key: [] for key in self.partitions}
+            partitions.update({key: [(start, end)] for key, start, end in series_runs(df)})
+            self.df, self.partitions = df, partitions
+            self._appended_chunks = 0
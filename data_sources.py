@@ -0,0 +1,104 @@
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_index import KEY_COLUMNS, HierarchyIndex, PartitionIndex
+
+COLUMNS = KEY_COLUMNS + ["date", "E", "F", "G", "H"]
+HIVE_COLUMNS = ["region", "C", "D"]
+
+
+###############################
+# 1) Filter predicate
+###############################
+def build_filter_predicate(filters):
+    """Combine the region/C/D/A/date filters into a single polars expression (None = no filter)."""
+    predicates = [pl.col(col).is_in(filters[col]) for col in KEY_COLUMNS if filters[col]]
+
+    date_start, date_end = filters['date_range'] or (None, None)
+    if date_start and date_end:
+        predicates.append(pl.col('date').is_between(pl.lit(date_start), pl.lit(date_end)))
+
+    if not predicates:
+        return None
+    return pl.all_horizontal(predicates)
+
+
+###############################
+# 2) Out-of-core sources
+###############################
+class LazyFrameSource:
+    """
+    A data source backed by a polars LazyFrame scan.
+
+    Exposes the same read interface as PartitionIndex (hierarchy, date_range, keys,
+    lazy, version, filter), but every filter is a lazy query, so the region/C/D/A/date
+    predicate is pushed down into the scan and only the matching files / row groups
+    are read.
+    """
+    def __init__(self, lazy_frame):
+        self.lazy_frame = lazy_frame.select(COLUMNS)
+
+        key_df = self.lazy_frame.select(KEY_COLUMNS).unique().sort(KEY_COLUMNS).collect()
+        self._keys = list(key_df.iter_rows())
+        self.hierarchy = HierarchyIndex(self._keys)
+
+        bounds = self.lazy_frame.select(
+            pl.col("date").min().alias("min"),
+            pl.col("date").max().alias("max"),
+        ).collect()
+        self._date_range = (bounds["min"].item(), bounds["max"].item())
+
+    def date_range(self):
+        return self._date_range
+
+    def keys(self):
+        return list(self._keys)
+
+    def lazy(self):
+        """The scan, rows in file order (RollupCube aggregates it without sorting)."""
+        return self.lazy_frame
+
+    def version(self, filters):
+        """Scans are read-only (no appends), so every filter state has the same version."""
+        return ()
+
+    def filter(self, filters):
+        lazy = self.lazy_frame
+        predicate = build_filter_predicate(filters)
+        if predicate is not None:
+            lazy = lazy.filter(predicate)
+        return lazy.collect()
+
+
+def scan_parquet_source(path, hive_partitioned=False):
+    """
+    Lazily scan a Parquet file or dataset directory.
+    With `hive_partitioned`, `path` is a region=/C=/D= directory tree (see write_hive_dataset).
+    """
+    if hive_partitioned:
+        lazy = pl.scan_parquet(f"{path}/**/*.parquet", hive_partitioning=True)
+    else:
+        lazy = pl.scan_parquet(path)
+    return LazyFrameSource(lazy)
+
+
+def scan_ipc_source(path):
+    """Lazily scan an uncompressed Arrow IPC file; polars memory-maps it instead of reading it in."""
+    return LazyFrameSource(pl.scan_ipc(path))
+
+
+def mmap_ipc_source(path):
+    """
+    Memory-map an Arrow IPC file written by write_generated_dataset into a PartitionIndex.
+
+    Numeric, date and string-view columns stay backed by the file's pages, so every
+    process mapping the same file shares one copy of the data through the OS page cache.
+    """
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return PartitionIndex(pl.from_arrow(table, rechunk=False), presorted=True)
+
+
+def write_hive_dataset(table, root):
+    """Append an Arrow table to a Parquet dataset hive-partitioned by region/C/D."""
+    pq.write_to_dataset(table, root, partition_cols=HIVE_COLUMNS)
@@ -1,57 +1,249 @@
+import argparse
+import logging
+import multiprocessing
+import operator
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, reduce
 import pandas as pd
 import polars as pl
 import panel as pn
+import param
 import holoviews as hv
 import hvplot.pandas  # important for hvplot on pandas DataFrames
 from holoviews import opts
-import random
+from bokeh.models import CustomJSTickFormatter
+from panel.io.state import set_curdoc
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime, timedelta
 
+from data_index import KEY_COLUMNS, PartitionIndex
+from data_sources import (
+    build_filter_predicate, mmap_ipc_source, scan_ipc_source, scan_parquet_source, write_hive_dataset,
+)
+from metrics import METRICS, MetricsHandler, instrument_websocket, payload_view
+from rollups import RollupCube, select_aggregates
+from view_cache import VIEW_CACHE_MAX_BYTES, ViewCache
+
 pn.extension(sizing_mode="stretch_width")
 hv.extension('bokeh')
 
+log = logging.getLogger(__name__)
+
 ###############################
 # 1) Generate sample dataframe
 ###############################
-def generate_full_df():
-    random.seed(42)
-    start_date = datetime.today() - timedelta(days=365*5)
-    date_range = [start_date + timedelta(days=i) for i in range(365*5)]
-
-    combos = {
-        ("North", "C1", "D1"): ["A1", "A2"] + [f"A{i}" for i in range(3, 100)],
-        ("North", "C1", "D2"): ["A3"],
-        ("North", "C2", "D1"): ["A4", "A5"],
-        ("North", "C2", "D2"): ["A6"],
-        ("South", "C1", "D1"): ["A7"],
-        ("South", "C1", "D2"): ["A8", "A9"],
-        ("South", "C2", "D1"): ["A10"],
-        ("South", "C2", "D2"): ["A11", "A12"]
-    }
+DEFAULT_COMBOS = {
+    ("North", "C1", "D1"): ["A1", "A2"] + [f"A{i}" for i in range(3, 100)],
+    ("North", "C1", "D2"): ["A3"],
+    ("North", "C2", "D1"): ["A4", "A5"],
+    ("North", "C2", "D2"): ["A6"],
+    ("South", "C1", "D1"): ["A7"],
+    ("South", "C1", "D2"): ["A8", "A9"],
+    ("South", "C2", "D1"): ["A10"],
+    ("South", "C2", "D2"): ["A11", "A12"]
+}
+
+
+def series_keys(num_series=None):
+    """
+    The (region, C, D, A) keys to generate.
+    Defaults to the 109 series of DEFAULT_COMBOS; larger counts add extra A values
+    round-robin over the (region, C, D) combos.
+    """
+    keys = [(r, c, d, a) for (r, c, d), a_list in DEFAULT_COMBOS.items() for a in a_list]
+    if num_series is None:
+        return keys
+    if num_series <= len(keys):
+        return keys[:num_series]
+
+    prefixes = list(DEFAULT_COMBOS)
+    for i in range(num_series - len(keys)):
+        r, c, d = prefixes[i % len(prefixes)]
+        keys.append((r, c, d, f"A{100 + i}"))
+    return keys
+
 
-    data_list = []
-    for (r, c, d), a_list in combos.items():
-        for a_val in a_list:
-            for dt in date_range:
-                data_list.append({
-                    "region": r,
-                    "C": c,
-                    "D": d,
-                    "A": a_val,
-                    "date": dt,
-                    "E": random.uniform(1.0, 100.0),
-                    "F": random.uniform(1.0, 100.0),
-                    "G": random.uniform(1.0, 100.0),
-                    "H": random.uniform(1.0, 100.0)
-                })
-
-    # Return a polars DataFrame with columns G,H as cumulative sums grouped by region/C/D/A
-    return pl.DataFrame(data_list).with_columns(
-        pl.col("G").cum_sum().over("region", "C", "D", "A").alias("G"),
-        pl.col("H").cum_sum().over("region", "C", "D", "A").alias("H")
+def generate_series_frame(keys, days, rng, start_date, cumulate=True):
+    """
+    One row per (series, day) with E..H uniform in [1, 100) and G/H cumulated per series
+    (with `cumulate=False`, left as the daily increments append_rows takes).
+    """
+    key_df = pl.DataFrame(keys, schema=["region", "C", "D", "A"], orient="row")
+    date_df = pl.DataFrame({
+        "date": pl.Series(np.datetime64(start_date, "us") + np.arange(days) * np.timedelta64(1, "D"))
+    })
+
+    shape = (len(keys), days)
+    # Rows are contiguous per series (the cross join keeps key-major, date-minor order),
+    # so the grouped cum_sum is a row-wise cumsum
+    cumsum = (lambda values: values.cumsum(axis=1)) if cumulate else (lambda values: values)
+    return key_df.join(date_df, how="cross", maintain_order="left_right").with_columns(
+        E=rng.uniform(1.0, 100.0, shape).ravel(),
+        F=rng.uniform(1.0, 100.0, shape).ravel(),
+        G=cumsum(rng.uniform(1.0, 100.0, shape)).ravel(),
+        H=cumsum(rng.uniform(1.0, 100.0, shape)).ravel(),
     )
 
 
+def generate_full_df(num_series=None, days=365*5, seed=42):
+    rng = np.random.default_rng(seed)
+    start_date = datetime.today() - timedelta(days=days)
+    return generate_series_frame(series_keys(num_series), days, rng, start_date)
+
+
+def write_generated_dataset(path, num_series=None, days=365*5, seed=42,
+                            series_per_chunk=100, file_format="parquet"):
+    """
+    Stream a generated dataset to a single Parquet or Arrow IPC file (or, with
+    file_format="hive", a Parquet directory partitioned by region/C/D),
+    `series_per_chunk` series at a time, so datasets larger than RAM can be produced.
+
+    IPC files keep string-view key columns so mmap_ipc_source can map them without copying.
+    """
+    rng = np.random.default_rng(seed)
+    start_date = datetime.today() - timedelta(days=days)
+    keys = series_keys(num_series)
+
+    writer = None
+    try:
+        for i in range(0, len(keys), series_per_chunk):
+            frame = generate_series_frame(keys[i:i + series_per_chunk], days, rng, start_date)
+            if file_format == "ipc":
+                table = frame.to_arrow(compat_level=pl.CompatLevel.newest())
+            else:
+                table = frame.to_arrow()
+            if file_format == "hive":
+                write_hive_dataset(table, path)
+                continue
+            if writer is None:
+                if file_format == "parquet":
+                    writer = pq.ParquetWriter(path, table.schema)
+                elif file_format == "ipc":
+                    writer = pa.ipc.new_file(path, table.schema)
+                else:
+                    raise ValueError(f"Unknown file format: {file_format!r}")
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
+
+# Columns stored as running totals per series (generate_series_frame cumulates them)
+CUMULATIVE_COLUMNS = ["G", "H"]
+
+
+def append_rows(source, rollups, rows):
+    """
+    Append new daily rows to an in-memory source (PartitionIndex) and its RollupCube.
+
+    `rows` hold E..H per (region, C, D, A, date) with G/H as daily increments, which
+    continue from each series' stored running total. Only the changed series are
+    re-indexed and re-aggregated; cache keys carry per-series versions (see
+    FilteredData.key), so only the cached filter states that include them are rebuilt.
+    Returns {series key: first appended date}.
+    """
+    changed = source.append(rows, cumulative=CUMULATIVE_COLUMNS)
+    rollups.update(changed)
+    return changed
+
+
+# Live mode (--live): a new day of rows per series every LIVE_INTERVAL_MS; live charts
+# keep the latest LIVE_WINDOW_DAYS points per series, the live table LIVE_TABLE_ROWS rows
+LIVE_INTERVAL_MS = 1000
+LIVE_WINDOW_DAYS = 365
+LIVE_TABLE_ROWS = 500
+
+
+class LiveFeed:
+    """
+    Local stand-in for a real feed (a file tail, queue or socket): a thread putting
+    the next day of rows for every series on `queue` every `interval_ms`, with G/H
+    as daily increments, as append_rows takes them.
+    """
+    def __init__(self, keys, start_date, interval_ms=LIVE_INTERVAL_MS, seed=0):
+        self.keys = keys
+        self.next_date = start_date
+        self.interval_ms = interval_ms
+        self.rng = np.random.default_rng(seed)
+        self.queue = queue.Queue()
+        self._stop = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name="live-feed", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_ms / 1000):
+            self.queue.put(generate_series_frame(self.keys, 1, self.rng, self.next_date, cumulate=False))
+            self.next_date += timedelta(days=1)
+
+
+class LiveHub:
+    """
+    Consumes a LiveFeed for the whole process: appends each batch to the shared source
+    and rollups (append_rows), then hands the stored rows (G/H cumulated) to every
+    subscribed session callback. Batches that queued up meanwhile are appended as one.
+    A failing batch or subscriber is logged and skipped; stop() ends the feed and the hub.
+    """
+    def __init__(self, source, rollups, feed):
+        self.source = source
+        self.rollups = rollups
+        self.feed = feed
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.add(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers.discard(callback)
+
+    def start(self):
+        self.feed.start()
+        threading.Thread(target=self._run, name="live-hub", daemon=True).start()
+
+    def stop(self):
+        self.feed.stop()
+        self.feed.queue.put(None)  # wakes _run, which returns once it reaches it
+
+    def _run(self):
+        while True:
+            batches = [self.feed.queue.get()]
+            while not self.feed.queue.empty():
+                batches.append(self.feed.queue.get_nowait())
+            rows = [batch for batch in batches if batch is not None]
+            if rows:
+                try:
+                    self.publish(pl.concat(rows))
+                except Exception:
+                    log.exception("Appending %d live batches failed", len(rows))
+            if len(rows) < len(batches):
+                return
+
+    def publish(self, rows):
+        changed = append_rows(self.source, self.rollups, rows)
+        stored = self.source.appended_rows(changed)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(stored)
+            except Exception:
+                log.exception("Live subscriber %r failed", callback)
+
+
 ###############################
 # 2) Chart Config + Axis Config
 ###############################
@@ -69,16 +261,163 @@ AXIS_CONFIG = {
     "H": "right",
 }
 
+# How each column is read from a rollup level (see rollups.py) when a long date range
+# is charted: bars sum their bucket, the cumulative lines show its last value.
+CHART_ROLLUPS = {
+    "E": "sum",
+    "F": "sum",
+    "G": "last",
+    "H": "last",
+}
+
+CHART_WIDTH = 800
+GALLERY_CHART_WIDTH = 500
+
+# Split charts: each group's figure sits in a slot SPLIT_CHART_HEIGHT px high inside a
+# scrolling feed SPLIT_FEED_HEIGHT px high; SPLIT_LOAD_BUFFER groups on each side of the
+# visible ones are built and rendered ahead of scrolling
+SPLIT_CHART_HEIGHT = 420
+SPLIT_FEED_HEIGHT = 900
+SPLIT_LOAD_BUFFER = 3
+
+
+# Rendering mode by number of points drawn in one chart: plain canvas glyphs below
+# WEBGL_THRESHOLD, WebGL glyphs up to RASTERIZE_THRESHOLD, and a server-side
+# rasterized image above it (only when the optional datashader package is installed).
+WEBGL_THRESHOLD = 20_000
+RASTERIZE_THRESHOLD = 250_000
+
+try:
+    from holoviews.operation.datashader import rasterize
+    HAS_DATASHADER = True
+except ImportError:
+    HAS_DATASHADER = False
+
+
+def render_mode(n_points):
+    if n_points >= RASTERIZE_THRESHOLD and HAS_DATASHADER:
+        return "raster"
+    if n_points >= WEBGL_THRESHOLD:
+        return "webgl"
+    return "canvas"
+
+
+def render_kwargs(mode):
+    """Extra hvplot kwargs for point-per-row charts (lines, scatters) in the given mode."""
+    return {"rasterize": True} if mode == "raster" else {}
+
+
+def raster_strokes(parts, kind):
+    """
+    (x, y) arrays drawing every (dates, values) part as one NaN-separated line, so a
+    whole axis rasterizes into a single image: "line" parts one after another, "bar"
+    parts as a vertical stroke from 0 per point.
+    """
+    dates = np.concatenate([part_dates for part_dates, _ in parts])
+    values = np.concatenate([part_values for _, part_values in parts])
+    if kind == "bar":
+        strokes = np.column_stack([np.zeros(len(values)), values, np.full(len(values), np.nan)])
+        return np.repeat(dates, 3), strokes.ravel()
+    # Each line ends on a NaN at its last date, which breaks it from the next one
+    xs = [array for part_dates, _ in parts for array in (part_dates, part_dates[-1:])]
+    ys = [
+        array for _, part_values in parts
+        for array in (part_values, np.full(min(len(part_values), 1), np.nan))
+    ]
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+def apply_render_mode(plot, mode):
+    if mode == "webgl":
+        return plot.opts(backend_opts={"plot.output_backend": "webgl"})
+    return plot
+
+
+def send_all(pipes_data):
+    """
+    Send data to several Pipes / Buffers ([(stream, data)]) with one trigger, so each
+    figure showing them re-renders once rather than once per stream. The streams must
+    name their data apart (see ChartView.create_plot_view) for a joint trigger.
+    """
+    streams = []
+    for stream, data in pipes_data:
+        stream.update(data=data)
+        streams.append(stream)
+    if streams:
+        hv.streams.Stream.trigger(streams)
+
+
+# Optional compact wire encoding for chart data (--compact-wire): values are sent as
+# float32 and dates as integer days since the epoch (Bokeh narrows int64 to int32
+# buffers), instead of float64 values and float64 millisecond timestamps.
+def compact_arrays(arrays, shared_dates=None):
+    """
+    {column: ndarray} with datetimes as epoch days and values as float32.
+    Date arrays are converted once per `shared_dates` dict (keyed by array identity),
+    so series that shared an x array still share its compact copy.
+    """
+    shared_dates = {} if shared_dates is None else shared_dates
+    compact = {}
+    for col, values in arrays.items():
+        if values.dtype.kind == "M":
+            if id(values) not in shared_dates:
+                shared_dates[id(values)] = (values, values.astype("datetime64[D]").astype(np.int64))
+            compact[col] = shared_dates[id(values)][1]
+        else:
+            compact[col] = values.astype(np.float32)
+    return compact
+
+
+def compact_frame(frame, columns):
+    """Polars equivalent of compact_arrays(), for the hvplot (pandas) charts."""
+    return frame.select(
+        pl.col("date").dt.epoch("d").cast(pl.Int64),
+        pl.col(columns).cast(pl.Float32),
+    )
+
+
+def visible_dates(x_range):
+    """The (start, end) dates of a chart's x-range: datetimes, or epoch days on the compact wire."""
+    return tuple(
+        (datetime(1970, 1, 1) + timedelta(days=float(x))).date()
+        if isinstance(x, (int, float, np.number)) else pd.Timestamp(x).date()
+        for x in x_range
+    )
+
+
+def day_tick_formatter():
+    """X-axis labels for epoch-day offsets (a new model per plot: models belong to one document)."""
+    return CustomJSTickFormatter(code="return new Date(tick * 86400000).toISOString().slice(0, 10)")
+
+
+# Fraction of each day's bin a compact-wire bar fills
+BAR_FILL = 0.8
+
+
+def day_bar_width(days):
+    """
+    bar_width that fills BAR_FILL of each bin on an epoch-day axis
+    (HoloViews divides bar_width by the x step for numeric axes).
+    """
+    step = int(np.diff(days).min()) if len(days) > 1 else 1
+    return BAR_FILL * step * step
+
 
 ###############################
 # 3) FilterSelectors
 ###############################
+# Filter changes arriving within this window are coalesced into one downstream update
+FILTER_DEBOUNCE_MS = 150
+
+
 class FilterSelectors(pn.viewable.Viewer):
-    def __init__(self, df, on_change=None):
-        self.df = df
+    def __init__(self, index, on_change=None):
+        self.hierarchy = index.hierarchy
         self._on_change = on_change
+        self._in_transaction = False
+        self._pending = None
 
-        all_regions = sorted(df.select(pl.col('region')).unique().to_series().to_list())
+        all_regions = self.hierarchy.options('region', {})
 
         self.region_selector = pn.widgets.MultiChoice(
             name='Region',
@@ -105,8 +444,7 @@ class FilterSelectors(pn.viewable.Viewer):
             placeholder='Select A...'
         )
 
-        min_date = df.select(pl.col('date').min()).item().date()
-        max_date = df.select(pl.col('date').max()).item().date()
+        min_date, max_date = (dt.date() for dt in index.date_range())
         self.date_range_picker = pn.widgets.DateRangePicker(
             name='Date Range',
             value=(min_date, max_date),
@@ -122,6 +460,12 @@ class FilterSelectors(pn.viewable.Viewer):
             sizing_mode="stretch_width"
         )
 
+        self._update_options = {
+            self.C_selector: self.update_c_options,
+            self.D_selector: self.update_d_options,
+            self.A_selector: self.update_a_options,
+        }
+
         # Watch changes
         self.region_selector.param.watch(self.region_changed, 'value')
         self.C_selector.param.watch(self.c_changed, 'value')
@@ -130,56 +474,67 @@ class FilterSelectors(pn.viewable.Viewer):
         self.date_range_picker.param.watch(self.any_filter_changed, 'value')
 
     def region_changed(self, event):
-        self.C_selector.value = []
-        self.D_selector.value = []
-        self.A_selector.value = []
-        self.update_c_options()
-        self.any_filter_changed(event)
+        self.cascade(event, [self.C_selector, self.D_selector, self.A_selector])
 
     def c_changed(self, event):
-        self.D_selector.value = []
-        self.A_selector.value = []
-        self.update_d_options()
-        self.any_filter_changed(event)
+        self.cascade(event, [self.D_selector, self.A_selector])
 
     def d_changed(self, event):
-        self.A_selector.value = []
-        self.update_a_options()
-        self.any_filter_changed(event)
+        self.cascade(event, [self.A_selector])
 
     def a_changed(self, event):
+        self.cascade(event, [])
+
+    def cascade(self, event, dependents):
+        """
+        Clear the dependent selectors and refresh their options as one transaction:
+        the watchers they fire while being cleared are ignored, so a single user
+        action produces a single filter-change notification.
+        """
+        if self._in_transaction:
+            return
+        self._in_transaction = True
+        try:
+            for selector in dependents:
+                selector.value = []
+            for selector in dependents:
+                self._update_options[selector]()
+        finally:
+            self._in_transaction = False
         self.any_filter_changed(event)
 
     def any_filter_changed(self, event):
+        """Debounce: changes within FILTER_DEBOUNCE_MS of each other are notified once."""
+        doc = pn.state.curdoc
+        if doc is None or doc.session_context is None:
+            # Not in a server session (scripts, benchmarks): notify synchronously
+            self.notify()
+            return
+
+        if self._pending is not None:
+            try:
+                doc.remove_timeout_callback(self._pending)
+            except ValueError:
+                pass  # already ran
+        self._pending = doc.add_timeout_callback(partial(self._notify_in_doc, doc), FILTER_DEBOUNCE_MS)
+
+    def _notify_in_doc(self, doc):
+        with set_curdoc(doc):
+            self.notify()
+
+    def notify(self):
+        self._pending = None
         if self._on_change:
             self._on_change()
 
     def update_c_options(self):
-        filtered_df = self.df
-        if self.region_selector.value:
-            filtered_df = filtered_df.filter(pl.col('region').is_in(self.region_selector.value))
-        valid_c = sorted(filtered_df.select(pl.col('C')).unique().to_series().to_list())
-        self.C_selector.options = valid_c
+        self.C_selector.options = self.hierarchy.options('C', self.get_filters())
 
     def update_d_options(self):
-        filtered_df = self.df
-        if self.region_selector.value:
-            filtered_df = filtered_df.filter(pl.col('region').is_in(self.region_selector.value))
-        if self.C_selector.value:
-            filtered_df = filtered_df.filter(pl.col('C').is_in(self.C_selector.value))
-        valid_d = sorted(filtered_df.select(pl.col('D')).unique().to_series().to_list())
-        self.D_selector.options = valid_d
+        self.D_selector.options = self.hierarchy.options('D', self.get_filters())
 
     def update_a_options(self):
-        filtered_df = self.df
-        if self.region_selector.value:
-            filtered_df = filtered_df.filter(pl.col('region').is_in(self.region_selector.value))
-        if self.C_selector.value:
-            filtered_df = filtered_df.filter(pl.col('C').is_in(self.C_selector.value))
-        if self.D_selector.value:
-            filtered_df = filtered_df.filter(pl.col('D').is_in(self.D_selector.value))
-        valid_a = sorted(filtered_df.select(pl.col('A')).unique().to_series().to_list())
-        self.A_selector.options = valid_a
+        self.A_selector.options = self.hierarchy.options('A', self.get_filters())
 
     def get_filters(self):
         return {
@@ -192,54 +547,429 @@ class FilterSelectors(pn.viewable.Viewer):
 
 
 ###############################
-# 4) TableView
+# 4) Shared filtered data
 ###############################
+def filter_key(filters):
+    """Normalize the output of FilterSelectors.get_filters() into a hashable key."""
+    date_start, date_end = filters['date_range'] or (None, None)
+    return (
+        tuple(tuple(sorted(filters[col])) for col in KEY_COLUMNS),
+        (date_start, date_end),
+    )
+
+
+def group_arrays(frame, group_cols, columns):
+    """
+    Split `frame` by `group_cols` into {group_keys: {column: ndarray}}, sorted by key.
+    Columns are handed over with Series.to_numpy(), which is zero-copy for
+    numeric/datetime columns without nulls.
+    """
+    parts = frame.partition_by(group_cols, as_dict=True, maintain_order=True)
+    return {
+        keys: {col: part[col].to_numpy() for col in columns}
+        for keys, part in sorted(parts.items())
+    }
+
+
+def series_label(col, group_keys):
+    """Legend label of one column of one (region, C, D, A) series in the combined chart."""
+    return " | ".join((col, *group_keys))
+
+
+def long_series_frame(frame, columns, compact=False):
+    """
+    Melt the `columns` of a chart frame into one long frame: a (series, date, value) row
+    per point, `series` being its series_label(). With `compact`, dates and values are
+    encoded as by compact_arrays().
+    """
+    long = frame.unpivot(
+        on=list(CHART_CONFIG), index=KEY_COLUMNS + ["date"], variable_name="column", value_name="value"
+    ).filter(pl.col("column").is_in(columns))
+    return long.select(
+        pl.concat_str(["column", *KEY_COLUMNS], separator=" | ").alias("series"),
+        pl.col("date").dt.epoch("d").cast(pl.Int64) if compact else pl.col("date"),
+        pl.col("value").cast(pl.Float32) if compact else pl.col("value"),
+    )
+
+
+def loading_placeholder():
+    return pn.pane.Markdown(
+        "Loading...",
+        sizing_mode="stretch_width",
+        css_classes=['no-data']
+    )
+
+
+# Worker pool shared by every view build; polars releases the GIL while it filters
+VIEW_BUILD_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="view-build")
+
+
+class BackgroundBuild:
+    """
+    Runs a view's builds on VIEW_BUILD_POOL while the view shows its loading state.
+
+    Each submit() bumps the view's generation token: a superseded build is cancelled
+    if it has not started yet, and its result is dropped if it has. The result of the
+    latest build is applied on the session's event loop. Outside a server session
+    (scripts, benchmarks) builds run synchronously.
+
+    The time from submit() to the applied result is recorded as the `name` view's
+    "render" latency. A failed build is logged and shown as an alert at the top of
+    the view, above its last good content, until the next build succeeds.
+    """
+    def __init__(self, view, name):
+        self.view = view
+        self.name = name
+        self.generation = 0
+        self._future = None
+        self._alert = None
+
+    def submit(self, build, apply):
+        started = time.perf_counter()
+        doc = pn.state.curdoc
+        if doc is None or doc.session_context is None:
+            apply(build())
+            self._record(started)
+            return
+
+        self.generation += 1
+        generation = self.generation
+        if self._future is not None:
+            self._future.cancel()
+
+        self.view.loading = True
+        self._future = VIEW_BUILD_POOL.submit(build)
+        self._future.add_done_callback(
+            lambda future: self._on_done(future, generation, apply, doc, started)
+        )
+
+    def _on_done(self, future, generation, apply, doc, started):
+        if future.cancelled() or generation != self.generation:
+            return  # superseded
+        doc.add_next_tick_callback(partial(self._apply, future, generation, apply, doc, started))
+
+    def _apply(self, future, generation, apply, doc, started):
+        if generation != self.generation:
+            return
+        with set_curdoc(doc), payload_view(self.name):
+            try:
+                error = future.exception()
+                if error is None:
+                    apply(future.result())
+            except Exception as apply_error:
+                error = apply_error
+            finally:
+                self.view.loading = False
+            if error is not None:
+                log.error("Building the %s view failed", self.name, exc_info=error)
+            self.show_error(error)
+        self._record(started)
+
+    def show_error(self, error):
+        """Show `error` in an alert at the top of the view (None clears it)."""
+        if error is None:
+            if self._alert is not None:
+                self.view.remove(self._alert)
+                self._alert = None
+            return
+        message = f"Could not update the {self.name} view: {error}"
+        if self._alert is None:
+            self._alert = pn.pane.Alert(message, alert_type="danger")
+            self.view.insert(0, self._alert)
+        else:
+            self._alert.object = message
+
+    def _record(self, started):
+        METRICS.observe(self.name, "render", (time.perf_counter() - started) * 1000)
+
+
+class FilteredData:
+    """
+    The filtered frame shared by every view.
+    It is computed once per filter state (via the partition index), however many views
+    read it, and kept in the LRU `data_cache` so revisiting a filter state is free.
+
+    `data_cache` only holds immutable data (frames, arrays) and may be shared between
+    sessions; views cache their built chart objects in the session's own `cache`.
+
+    `rollups` is the source's RollupCube (built here when not given); charts over long
+    date ranges read a rollup level through rollup() instead of the daily frame.
+    """
+    def __init__(self, index, filter_selectors, cache=None, data_cache=None, rollups=None):
+        self.index = index
+        self.filter_selectors = filter_selectors
+        self.cache = cache if cache is not None else ViewCache()
+        self.data_cache = data_cache if data_cache is not None else self.cache
+        self.rollups = rollups if rollups is not None else RollupCube(index)
+
+    def filters(self):
+        """
+        One snapshot of the filter state. Views take it once per build and pass it to
+        both the cache key and the builder, so a filter change while a build runs on
+        the pool can't store the new state's data under the old state's key.
+        """
+        filters = self.filter_selectors.get_filters()
+        return {col: list(value) if isinstance(value, list) else value for col, value in filters.items()}
+
+    def key(self, filters=None):
+        """Normalized filter state, the base of every cache key."""
+        return self._key(self.filters() if filters is None else filters)
+
+    def _key(self, filters):
+        # The append versions of the selected series make appends miss only the filter
+        # states they change; the stale entries age out of the LRU caches
+        return filter_key(filters) + (self.index.version(filters),)
+
+    def frame(self, filters=None):
+        filters = self.filters() if filters is None else filters
+        return self.data_cache.get_or_build(
+            ('frame', self._key(filters)), partial(self._filter, filters)
+        )
+
+    def _filter(self, filters):
+        with METRICS.span("shared", "filter"):
+            return self.index.filter(filters)
+
+    def latest(self, rows_per_series, filters=None):
+        """The latest `rows_per_series` rows of each selected series, whatever the date range (live views)."""
+        filters = {**(self.filters() if filters is None else filters), 'date_range': None}
+        return self.data_cache.get_or_build(
+            ('latest', rows_per_series, self._key(filters)), partial(self._latest, filters, rows_per_series)
+        )
+
+    def _latest(self, filters, rows_per_series):
+        with METRICS.span("shared", "filter"):
+            frame = self.index.filter(filters)
+            return frame.group_by(KEY_COLUMNS, maintain_order=True).tail(rows_per_series)
+
+    def matching(self, rows):
+        """The rows (e.g. a live batch) of the selected series, whatever their date."""
+        predicate = build_filter_predicate({**self.filters(), 'date_range': None})
+        return rows if predicate is None else rows.filter(predicate)
+
+    def rollup_level(self, width, filters=None):
+        """The coarsest rollup level that still fills a chart `width` pixels wide."""
+        filters = self.filters() if filters is None else filters
+        return self.rollups.level_for(filters['date_range'], width)
+
+    def rollup(self, level, filters=None):
+        """The filtered rows of a rollup level (the shared frame itself for "daily")."""
+        filters = self.filters() if filters is None else filters
+        if level == "daily":
+            return self.frame(filters)
+        # The level's own versions too: the source is bumped before update() reaches the
+        # levels, so a read in between must not be cached under the source's new versions
+        key = ('rollup', level, self._key(filters), self.rollups.version(level, filters))
+        return self.data_cache.get_or_build(key, partial(self._filter_rollup, level, filters))
+
+    def _filter_rollup(self, level, filters):
+        with METRICS.span("shared", "rollup"):
+            return self.rollups.filter(level, filters)
+
+    def pandas(self, filters=None):
+        """Arrow-backed pandas view of the frame: numeric and date columns share polars' buffers."""
+        filters = self.filters() if filters is None else filters
+        return self.data_cache.get_or_build(('pandas', self._key(filters)), partial(self._to_pandas, filters))
+
+    def _to_pandas(self, filters):
+        frame = self.frame(filters)
+        with METRICS.span("shared", "to_pandas"):
+            return frame.to_pandas(use_pyarrow_extension_array=True)
+
+    def compact_pandas(self, filters=None):
+        """Date and E..H of the frame in the compact wire encoding (see compact_frame)."""
+        filters = self.filters() if filters is None else filters
+        return self.data_cache.get_or_build(
+            ('compact_pandas', self._key(filters)), partial(self._to_compact_pandas, filters)
+        )
+
+    def _to_compact_pandas(self, filters):
+        frame = self.frame(filters)
+        with METRICS.span("shared", "to_pandas"):
+            return compact_frame(frame, list(CHART_CONFIG)).to_pandas()
+
+
+###############################
+# 5) TableView
+###############################
+TABLE_COLUMNS = ["region", "C", "D", "A", "date", "E", "F", "G", "H"]
+
+TABLE_FILTER_OPS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
 class TableView(pn.viewable.Viewer):
-    def __init__(self, df, filter_selectors):
-        self.df = df
+    """
+    Remote-data table: paging, sorting and the column filter are evaluated in polars
+    on the server, and only the visible page of rows is sent to the browser.
+
+    With `live_rows`, a second table above it follows the live feed: the latest
+    `live_rows` rows of the selected series, with new rows streamed in (stream_rows).
+    """
+    def __init__(self, filtered_data, filter_selectors, live_rows=None):
+        self.filtered_data = filtered_data
         self.filter_selectors = filter_selectors
+        self.live_rows = live_rows
 
         self.table = pn.widgets.Tabulator(
-            value=pd.DataFrame(columns=["region", "C", "D", "A", "date", "E", "F", "G", "H"]),
+            value=pd.DataFrame(columns=TABLE_COLUMNS),
             show_index=False,
+            # Header clicks would only reorder the page in the browser; sort with sort_by
+            sortable=False,
             sizing_mode="stretch_both",
             min_height=300
         )
-        self.view = pn.Column(self.table, sizing_mode="stretch_both")
 
-    def update_table(self):
-        filters = self.filter_selectors.get_filters()
-        filtered_df = self.df
-        if filters['region']:
-            filtered_df = filtered_df.filter(pl.col('region').is_in(filters['region']))
-        if filters['C']:
-            filtered_df = filtered_df.filter(pl.col('C').is_in(filters['C']))
-        if filters['D']:
-            filtered_df = filtered_df.filter(pl.col('D').is_in(filters['D']))
-        if filters['A']:
-            filtered_df = filtered_df.filter(pl.col('A').is_in(filters['A']))
-
-        date_start, date_end = filters['date_range']
-        if date_start and date_end:
-            filtered_df = filtered_df.filter(
-                (pl.col('date') >= pl.lit(date_start)) & (pl.col('date') <= pl.lit(date_end))
+        self.sort_by = pn.widgets.Select(name='Sort by', options=[''] + TABLE_COLUMNS, value='')
+        self.descending = pn.widgets.Checkbox(name='Descending', value=False)
+        self.filter_column = pn.widgets.Select(name='Filter column', options=[''] + TABLE_COLUMNS, value='')
+        self.filter_op = pn.widgets.Select(name='Op', options=list(TABLE_FILTER_OPS) + ['contains'], value='=')
+        self.filter_value = pn.widgets.TextInput(name='Value', placeholder='Filter value...')
+        self.page_size = pn.widgets.Select(name='Rows per page', options=[25, 50, 100, 500], value=100)
+        self.page = pn.widgets.IntInput(name='Page', value=1, start=1, end=1)
+        self.page_info = pn.pane.Markdown("", sizing_mode="stretch_width")
+
+        self.view = pn.Column(
+            pn.Row(
+                self.sort_by, self.descending,
+                self.filter_column, self.filter_op, self.filter_value,
+                self.page_size, self.page
+            ),
+            self.table,
+            self.page_info,
+            sizing_mode="stretch_both"
+        )
+        if live_rows:
+            self.live_table = pn.widgets.Tabulator(
+                value=pd.DataFrame(columns=TABLE_COLUMNS),
+                show_index=False,
+                disabled=True,
+                height=250,
+                sizing_mode="stretch_width"
             )
+            self.view[0:0] = [pn.pane.Markdown("**Latest rows (live)**"), self.live_table]
+
+        for widget in (self.sort_by, self.descending, self.filter_column,
+                       self.filter_op, self.filter_value, self.page_size):
+            widget.param.watch(self.update_table, 'value')
+        self.page.param.watch(self.show_page, 'value')
+        self.builder = BackgroundBuild(self.view, "table")
+        self._frame = None  # the last table_frame() built, which show_page() slices
+
+    def table_options(self):
+        """One snapshot of the column filter and sort widgets: (column, op, value, sort_by, descending)."""
+        return (
+            self.filter_column.value, self.filter_op.value, self.filter_value.value,
+            self.sort_by.value, self.descending.value
+        )
 
-        if filtered_df.is_empty():
-            df_pandas = pd.DataFrame(columns=["region", "C", "D", "A", "date", "E", "F", "G", "H"])
+    def column_filter(self, filters, col, op, value):
+        """The table's own column filter as a polars expression (None = no filter)."""
+        if not (col and value):
+            return None
+        if op == 'contains':
+            return pl.col(col).cast(pl.String).str.contains(value, literal=True)
+
+        dtype = self.filtered_data.frame(filters).schema[col]
+        if dtype == pl.String:
+            literal = pl.lit(value)
+        elif dtype.is_temporal():
+            literal = pl.lit(value).str.to_datetime(strict=False)
+        else:
+            literal = pl.lit(value).cast(dtype, strict=False)
+        return TABLE_FILTER_OPS[op](pl.col(col), literal)
+
+    def table_frame(self):
+        """The filtered frame with the column filter and sort applied, cached per state."""
+        filters, options = self.filtered_data.filters(), self.table_options()
+        return self.filtered_data.data_cache.get_or_build(
+            ('table', self.filtered_data.key(filters)) + options,
+            partial(self._build_table_frame, filters, options)
+        )
+
+    def _build_table_frame(self, filters, options):
+        col, op, value, sort_by, descending = options
+        lazy = self.filtered_data.frame(filters).lazy()
+        predicate = self.column_filter(filters, col, op, value)
+        if predicate is not None:
+            lazy = lazy.filter(predicate)
+        if sort_by:
+            lazy = lazy.sort(sort_by, descending=descending, maintain_order=True)
+        with METRICS.span("table", "filter_sort"):
+            return lazy.collect()
+
+    def update_table(self, *events):
+        """Re-evaluate filters and sort in the background, then show the first page."""
+        self.builder.submit(self.table_frame, self.show_first_page)
+
+    def show_first_page(self, frame):
+        self._frame = frame
+        n_pages = max(1, -(-len(frame) // self.page_size.value))
+        with param.discard_events(self.page):
+            self.page.param.update(value=1, end=n_pages)
+        self.show_page()
+        if self.live_rows:
+            self.show_latest()
+
+    def show_latest(self):
+        latest = self.filtered_data.latest(self.live_rows).sort('date', maintain_order=True)
+        self.live_table.value = latest.tail(self.live_rows).select(TABLE_COLUMNS).to_pandas()
+
+    def stream_rows(self, rows):
+        """
+        Live: append the new rows to the live table, dropping the oldest beyond `live_rows`.
+        Returns the number of rows streamed.
+        """
+        if not self.live_rows or rows.is_empty():
+            return 0
+        with METRICS.span("table", "stream"):
+            self.live_table.stream(
+                rows.select(TABLE_COLUMNS).to_pandas(), rollover=self.live_rows, follow=True
+            )
+        return len(rows)
+
+    def show_page(self, *events):
+        # Page changes slice the last built frame: the page count came from it, and
+        # re-filtering here would run on the event loop and could see newer filters
+        frame = self._frame
+        if frame is None:
+            return
+        size = self.page_size.value
+        page = frame.slice((self.page.value - 1) * size, size)
+
+        if page.is_empty():
+            df_pandas = pd.DataFrame(columns=TABLE_COLUMNS)
         else:
-            df_pandas = filtered_df.to_pandas()
+            with METRICS.span("table", "to_pandas"):
+                df_pandas = page.to_pandas()
 
-        self.table.value = df_pandas
+        with METRICS.span("table", "replace"), payload_view("table"):
+            self.table.value = df_pandas
+            self.page_info.object = f"{len(frame):,} rows · page {self.page.value} of {self.page.end}"
 
 
 ###############################
-# 5) ChartView with Multi-Axis
+# 6) ChartView with Multi-Axis
 ###############################
 class ChartView(pn.viewable.Viewer):
-    def __init__(self, df, filter_selectors):
-        self.df = df
+    """
+    The combined (or split) E..H chart of the selected series.
+
+    With `live_window`, the chart follows the live feed instead of the date range: it
+    shows the latest `live_window` days of each series, and stream_rows() streams new
+    points into its Buffers (dropping the oldest) without rebuilding the figure.
+    """
+    def __init__(self, filtered_data, filter_selectors, compact_wire=False, live_window=None):
+        self.filtered_data = filtered_data
         self.filter_selectors = filter_selectors
+        self.compact_wire = compact_wire
+        self.live_window = live_window
 
         self.selector = pn.widgets.MultiChoice(
             name='Columns',
@@ -248,6 +978,8 @@ class ChartView(pn.viewable.Viewer):
             placeholder='Pick columns...'
         )
         self.split_charts_checkbox = pn.widgets.Checkbox(name="Split Charts", value=False)
+        # (filter date range, visible dates) the combined chart was zoomed to, see zoom_to()
+        self._zoom = None
 
         self.view = pn.Column(
             pn.Row(self.selector, self.split_charts_checkbox),
@@ -257,139 +989,357 @@ class ChartView(pn.viewable.Viewer):
 
         self.selector.param.watch(self.update_charts, 'value')
         self.split_charts_checkbox.param.watch(self.update_charts, 'value')
+        self.builder = BackgroundBuild(self.view, "chart")
 
-    def create_plot_view(self):
-        filters = self.filter_selectors.get_filters()
+    def chart_state(self):
+        """
+        One snapshot of what the chart data depends on: (filters, columns, split_charts, zoom),
+        `zoom` being the visible dates of the combined chart (None = the filter date range).
+        """
+        filters = self.filtered_data.filters()
+        split_charts = self.split_charts_checkbox.value
+        zoom = None
+        if self._zoom is not None and not (split_charts or self.live_window):
+            date_range, visible = self._zoom
+            zoom = visible if date_range == filters['date_range'] else None
+        return filters, tuple(self.selector.value), split_charts, zoom
+
+    def chart_data(self):
+        """Cached _build_chart_data() for the current filters and column / split options."""
+        filters, columns, split_charts, zoom = state = self.chart_state()
+        key = (
+            'chart', self.filtered_data.key(filters), columns, split_charts, zoom, self.compact_wire,
+            self.live_window
+        )
+        return self.filtered_data.data_cache.get_or_build(key, partial(self._timed_chart_data, *state))
+
+    def _timed_chart_data(self, filters, columns, split_charts, zoom):
+        with METRICS.span("chart", "convert"):
+            return self._build_chart_data(filters, columns, split_charts, zoom)
+
+    def chart_window(self, filters, zoom):
+        """
+        (rollup level, date range) of the rows the chart reads: the coarsest level that
+        still fills the chart over the visible `zoom` dates (None = the filter date range),
+        read over them widened by their span on each side, so panning needn't refetch.
+        """
+        if zoom is None:
+            return self.filtered_data.rollup_level(CHART_WIDTH, filters), filters['date_range']
+        level = self.filtered_data.rollup_level(CHART_WIDTH, {**filters, 'date_range': zoom})
+        start, end = zoom
+        span = end - start
+        window_start, window_end = start - span, end + span
+        if filters['date_range']:
+            date_start, date_end = filters['date_range']
+            window_start, window_end = max(window_start, date_start), min(window_end, date_end)
+        return level, (window_start, window_end)
+
+    def zoom_to(self, x_range=None, **_):
+        """
+        RangeXY subscriber of the combined chart: re-read its rows when the visible dates
+        need another rollup level, or pan out of the rows read, so zooming in refines
+        the chart down to daily rows.
+        """
+        if x_range is None or None in x_range:
+            return
+        filters, _, split_charts, zoom = self.chart_state()
+        if split_charts or self.live_window:
+            return
+        visible = visible_dates(x_range)
+        level, window = self.chart_window(filters, zoom)
+        if self.chart_window(filters, visible)[0] == level and (
+            window is None or window[0] <= visible[0] and visible[1] <= window[1]
+        ):
+            return
+        self._zoom = (filters['date_range'], visible)
+        self.update_charts()
+
+    def _build_chart_data(self, filters, selected_columns, split_charts, zoom=None):
+        """
+        Return (structure, series) for a chart_state() snapshot.
+
+        `series` maps every (group, column) pair to the {'date', column} NumPy arrays its
+        glyph should show, taken straight from polars without a pandas conversion;
+        deselected columns map to empty arrays, so they can be hidden by patching
+        data instead of changing the figure. `structure` describes the figure itself
+        (groups, split mode, render mode). When there is nothing to draw, returns
+        (None, message). With `compact_wire`, the arrays are compact_arrays().
+
+        The combined (non-live) chart takes a single long frame instead,
+        {"all": long_series_frame()} of the selected columns; deselected columns
+        simply have no rows.
+
+        The rows come from the coarsest rollup level that still fills the chart over the
+        visible dates (see chart_window), with the columns aggregated per CHART_ROLLUPS
+        (live: the latest daily rows).
+        """
         if not (filters['region'] and filters['C'] and filters['D'] and filters['A']):
-            return pn.pane.Markdown(
-                "No data selected yet.",
-                sizing_mode="stretch_width",
-                css_classes=['no-data']
-            )
+            return None, "No data selected yet."
 
-        filtered_df = self.df
-        if filters['region']:
-            filtered_df = filtered_df.filter(pl.col('region').is_in(filters['region']))
-        if filters['C']:
-            filtered_df = filtered_df.filter(pl.col('C').is_in(filters['C']))
-        if filters['D']:
-            filtered_df = filtered_df.filter(pl.col('D').is_in(filters['D']))
-        if filters['A']:
-            filtered_df = filtered_df.filter(pl.col('A').is_in(filters['A']))
-
-        date_start, date_end = filters['date_range']
-        if date_start and date_end:
-            filtered_df = filtered_df.filter(
-                (pl.col('date') >= pl.lit(date_start)) & (pl.col('date') <= pl.lit(date_end))
-            )
+        if self.live_window:
+            chart_df = self.filtered_data.latest(self.live_window, filters)
+        else:
+            level, window = self.chart_window(filters, zoom)
+            level_rows = self.filtered_data.rollup(level, {**filters, 'date_range': window})
+            chart_df = select_aggregates(level_rows, level, CHART_ROLLUPS)
 
-        if filtered_df.is_empty():
+        if chart_df.is_empty():
+            return None, "No data after filters."
+
+        group_cols = ["region", "C", "D", "A"]
+        if not (split_charts or self.live_window):
+            groups = tuple(sorted(chart_df.select(group_cols).unique().iter_rows()))
+            series = {"all": long_series_frame(chart_df, list(selected_columns), compact=self.compact_wire)}
+        else:
+            grouped = group_arrays(chart_df, group_cols, ['date'] + list(CHART_CONFIG))
+            groups = tuple(grouped)
+
+            series = {}
+            for group_keys, arrays in grouped.items():
+                for col in CHART_CONFIG:
+                    if col not in selected_columns:
+                        series[(group_keys, col)] = {'date': arrays['date'][:0], col: arrays[col][:0]}
+                    else:
+                        series[(group_keys, col)] = {'date': arrays['date'], col: arrays[col]}
+
+            if self.compact_wire:
+                shared_dates = {}
+                series = {key: compact_arrays(arrays, shared_dates) for key, arrays in series.items()}
+
+        # Pick canvas / WebGL / raster by the points one figure can hold (all columns, so
+        # toggling columns never changes the mode): every group unless split, else the largest
+        if split_charts:
+            rows = max(len(arrays['date']) for arrays in grouped.values())
+        else:
+            rows = len(chart_df)
+        mode = render_mode(rows * len(CHART_CONFIG))
+        if self.live_window and mode == "raster":
+            mode = "webgl"  # a rasterized image can't be streamed into
+        return (groups, split_charts, mode), series
+
+    def create_plot_view(self, chart_data=None):
+        structure, series = chart_data or self.chart_data()
+        self._structure = structure
+        self._pipes = {}
+        if structure is None:
             return pn.pane.Markdown(
-                "No data after filters.",
+                series,
                 sizing_mode="stretch_width",
                 css_classes=['no-data']
             )
 
-        df_pandas = filtered_df.to_pandas()
-        selected_columns = self.selector.value
-        split_charts = self.split_charts_checkbox.value
-
-        group_cols = ["region", "C", "D", "A"]
-        grouped = df_pandas.groupby(group_cols)
+        group_keys_list, split_charts, mode = structure
+        # Each stream renames its `data` parameter apart so send_all can trigger them together;
+        # the DynamicMap callbacks take it as the single keyword they are passed
+        renames = ({'data': f'data{i}'} for i in range(len(series)))
+        if self.live_window:
+            # pandas-backed Buffers: HoloViews streams new rows into the existing data source
+            self._pipes = {
+                key: hv.streams.Buffer(
+                    pd.DataFrame(frame), length=self.live_window, index=False, rename=rename
+                )
+                for (key, frame), rename in zip(series.items(), renames)
+            }
+        else:
+            self._pipes = {
+                key: hv.streams.Pipe(data=frame, rename=rename)
+                for (key, frame), rename in zip(series.items(), renames)
+            }
 
         default_opts = dict(
-            legend='right',
-            width=800,
+            width=CHART_WIDTH,
             height=400
         )
+        if self.compact_wire:
+            default_opts['xformatter'] = day_tick_formatter()
+
+        def series_element(col, data, label):
+            if CHART_CONFIG.get(col, "line") == "bar":
+                element = hv.Bars(data, 'date', col, label=label).opts(**default_opts)
+                if self.compact_wire:
+                    element = element.opts(bar_width=day_bar_width(data['date']))
+                return element
+            return hv.Curve(data, 'date', col, label=label).opts(**default_opts)
+
+        def axis_columns(side, kind):
+            return [
+                col for col in CHART_CONFIG
+                if AXIS_CONFIG.get(col) == side and CHART_CONFIG[col] == kind
+            ]
+
+        def build_axis_image(side, kind, streams, parts):
+            # Raster mode: every `kind` series of the axis drawn as one Curve (see
+            # raster_strokes) and rasterized into one image; parts(contents) gives their
+            # [(dates, values)] from the streams' contents
+            columns = axis_columns(side, kind)
+            ydim = hv.Dimension(columns[0], label=", ".join(columns))
+
+            def strokes(**contents):
+                x, y = raster_strokes(parts(contents), kind)
+                return hv.Curve({'date': x, ydim.name: y}, 'date', ydim)
+
+            image = rasterize(hv.DynamicMap(strokes, streams=streams)).opts(**default_opts)
+            return image.opts(yaxis='right') if side == 'right' else image
+
+        def build_group_image(group_keys, side, kind):
+            columns = axis_columns(side, kind)
+            pipes = [self._pipes[(group_keys, col)] for col in columns]
+            names = [next(iter(pipe.contents)) for pipe in pipes]
+
+            def parts(contents):
+                return [(contents[name]['date'], contents[name][col]) for name, col in zip(names, columns)]
+
+            return build_axis_image(side, kind, pipes, parts)
+
+        def build_series(group_keys, col, group_label):
+            # One DynamicMap per series, fed by its Pipe so updates patch the existing glyph
+            label_str = f"{col} {group_label}"
+            return hv.DynamicMap(
+                lambda **contents: series_element(col, *contents.values(), label=label_str),
+                streams=[self._pipes[(group_keys, col)]]
+            )
 
-        def build_overlay_for_axis(group_data, columns, side='left', group_label=""):
-            subplots = []
-            for col in columns:
-                chart_type = CHART_CONFIG.get(col, "line")
-                label_str = f"{col} {group_label}"
-                if chart_type == "bar":
-                    chart_obj = group_data.hvplot.bar(
-                        x='date', y=col, label=label_str, **default_opts
-                    )
-                else:
-                    chart_obj = group_data.hvplot.line(
-                        x='date', y=col, label=label_str, **default_opts
+        def build_axis_overlay(side, kind):
+            # One overlay of every `kind` column on this axis, cut from the shared long frame.
+            # It holds an element per (group, column) label, selected or not, so toggling
+            # columns patches data instead of changing the figure
+            labels = [
+                (series_label(col, group_keys), col)
+                for group_keys in group_keys_list
+                for col in axis_columns(side, kind)
+            ]
+
+            if mode == "raster":
+                label_set = {label for label, _ in labels}
+
+                def parts(contents):
+                    data, = contents.values()
+                    selected = [
+                        (part['date'].to_numpy(), part['value'].to_numpy())
+                        for (label,), part in data.partition_by("series", as_dict=True).items()
+                        if label in label_set
+                    ]
+                    return selected or [(data['date'].to_numpy()[:0], data['value'].to_numpy()[:0])]
+
+                return build_axis_image(side, kind, [self._pipes["all"]], parts)
+
+            def overlay(**contents):
+                data, = contents.values()
+                parts = data.partition_by("series", as_dict=True)
+                empty = data.clear()
+                elements = {}
+                for label, col in labels:
+                    part = parts.get((label,), empty)
+                    element = series_element(
+                        col, {'date': part['date'].to_numpy(), col: part['value'].to_numpy()}, label
                     )
-                subplots.append(chart_obj)
+                    elements[label] = element.opts(yaxis='right') if side == 'right' else element
+                # A plain Overlay of the labelled elements: an NdOverlay would add its key to
+                # every row of every data source (for hover) and merge glyphs past legend_limit
+                return hv.Overlay(list(elements.values()))
+
+            axis_overlay = hv.DynamicMap(overlay, streams=[self._pipes["all"]])
+            return axis_overlay
+
+        def build_overlay_for_axis(group_keys, side='left', group_label=""):
+            columns = [col for col in CHART_CONFIG if AXIS_CONFIG.get(col) == side]
+            if mode == "raster":
+                kinds = dict.fromkeys(CHART_CONFIG[col] for col in columns)
+                subplots = [build_group_image(group_keys, side, kind) for kind in kinds]
+            else:
+                subplots = [build_series(group_keys, col, group_label) for col in columns]
 
             if not subplots:
                 return None
-            overlay = hv.Overlay(subplots)
+            overlay = reduce(operator.mul, subplots)
             if side == 'right':
                 overlay = overlay.opts(yaxis='right')
             return overlay
 
         if split_charts:
-            plots = []
-            for group_keys, group_data in grouped:
+            def build_group_plot(group_keys):
                 region_val, c_val, d_val, a_val = group_keys
                 group_label = f"in {region_val}, {c_val}, {d_val}, {a_val}"
 
-                left_cols = [col for col in selected_columns if AXIS_CONFIG.get(col) == 'left']
-                right_cols = [col for col in selected_columns if AXIS_CONFIG.get(col) == 'right']
+                left_overlay = build_overlay_for_axis(group_keys, side='left', group_label=group_label)
+                right_overlay = build_overlay_for_axis(group_keys, side='right', group_label=group_label)
 
-                left_overlay = build_overlay_for_axis(group_data, left_cols, side='left', group_label=group_label)
-                right_overlay = build_overlay_for_axis(group_data, right_cols, side='right', group_label=group_label)
-
-                if left_overlay and right_overlay:
+                if left_overlay is not None and right_overlay is not None:
                     final_overlay = left_overlay * right_overlay
-                elif left_overlay:
+                elif left_overlay is not None:
                     final_overlay = left_overlay
-                elif right_overlay:
-                    final_overlay = right_overlay
                 else:
-                    continue
+                    final_overlay = right_overlay
 
                 final_overlay = final_overlay.opts(
                     title=f"{region_val}, {c_val}, {d_val}, {a_val}",
                     click_policy='hide',
                     legend_position='right'
                 )
-                plots.append(final_overlay)
-
-            layout = hv.Layout(plots).cols(1)
-            return pn.Column(
-                pn.panel(layout, css_classes=['chart-panel'], width=1100),
-                pn.Spacer(height=600, sizing_mode="fixed"),
-                sizing_mode="fixed",
-                width=1150
+                final_overlay = apply_render_mode(final_overlay, mode)
+                return pn.pane.HoloViews(final_overlay, css_classes=['chart-panel'], width=1100)
+
+            # One fixed-size slot per group in a virtualized Feed: the Feed only renders the
+            # slots around the viewport, and a slot's figure is built when it first gets near it
+            slots = [
+                pn.Column(height=SPLIT_CHART_HEIGHT, width=1100, sizing_mode="fixed")
+                for _ in group_keys_list
+            ]
+
+            def load_groups(start, end):
+                for slot, group_keys in zip(slots[start:end], group_keys_list[start:end]):
+                    if not slot.objects:
+                        slot.objects = [build_group_plot(group_keys)]
+
+            def load_visible(event):
+                if event.new is not None:
+                    start, end = event.new
+                    load_groups(max(start - SPLIT_LOAD_BUFFER, 0), end + SPLIT_LOAD_BUFFER + 1)
+
+            load_groups(0, SPLIT_LOAD_BUFFER)
+            feed = pn.Feed(
+                *slots, load_buffer=SPLIT_LOAD_BUFFER, height=SPLIT_FEED_HEIGHT,
+                width=1130, sizing_mode="fixed"
             )
+            feed.param.watch(load_visible, 'visible_range')
+            return pn.Column(feed, sizing_mode="fixed", width=1150)
 
         else:
-            overlay_left = hv.Overlay([])
-            overlay_right = hv.Overlay([])
-
-            for group_keys, group_data in grouped:
-                region_val, c_val, d_val, a_val = group_keys
-                group_label = f"| {region_val} | {c_val} | {d_val} | {a_val}"
-
-                left_cols = [col for col in selected_columns if AXIS_CONFIG.get(col) == 'left']
-                right_cols = [col for col in selected_columns if AXIS_CONFIG.get(col) == 'right']
-
-                left_sub = build_overlay_for_axis(group_data, left_cols, side='left', group_label=group_label)
-                if left_sub:
-                    overlay_left *= left_sub
-
-                right_sub = build_overlay_for_axis(group_data, right_cols, side='right', group_label=group_label)
-                if right_sub:
-                    overlay_right *= right_sub
-
-            final_left = overlay_left
-            final_right = overlay_right.opts(yaxis='right')
+            if self.live_window:
+                # Live: one DynamicMap per series, each streamed into through its own Buffer
+                overlay_left = hv.Overlay([])
+                overlay_right = hv.Overlay([])
+
+                for group_keys in group_keys_list:
+                    group_label = f"| {' | '.join(group_keys)}"
+
+                    left_sub = build_overlay_for_axis(group_keys, side='left', group_label=group_label)
+                    if left_sub is not None:
+                        overlay_left *= left_sub
+
+                    right_sub = build_overlay_for_axis(group_keys, side='right', group_label=group_label)
+                    if right_sub is not None:
+                        overlay_right *= right_sub
+
+                final_overlay = overlay_left * overlay_right.opts(yaxis='right')
+            else:
+                # One grouped element per axis and chart type, whatever the number of groups
+                axis_kinds = dict.fromkeys(
+                    (AXIS_CONFIG[col], kind) for col, kind in CHART_CONFIG.items()
+                    if AXIS_CONFIG.get(col) in ('left', 'right')
+                )
+                axis_overlays = [build_axis_overlay(side, kind) for side, kind in sorted(axis_kinds)]
+                final_overlay = reduce(operator.mul, axis_overlays)
+                # Zooming re-reads the rows at the rollup level the visible dates need
+                hv.streams.RangeXY(source=axis_overlays[0]).add_subscriber(self.zoom_to)
 
-            final_overlay = final_left * final_right
             final_overlay = final_overlay.opts(
                 title="Combined Chart (Multi-Axis)",
                 click_policy='hide',
                 legend_position="right",
                 min_height=400
             )
+            final_overlay = apply_render_mode(final_overlay, mode)
 
             return pn.Column(
                 pn.panel(final_overlay, css_classes=['chart-panel'], sizing_mode="stretch_width"),
@@ -398,55 +1348,78 @@ class ChartView(pn.viewable.Viewer):
             )
 
     def update_charts(self, *events):
-        self.view[-1] = self.create_plot_view()
+        self.builder.submit(self.chart_data, self.apply_chart_data)
+
+    def apply_chart_data(self, chart_data):
+        structure, series = chart_data
+        # Live Buffers append what they are sent, so a live chart is rebuilt instead
+        if structure is not None and structure == self._structure and not self.live_window:
+            # Same figure: patch each glyph's data source in one batched document update
+            with METRICS.span("chart", "patch"), pn.io.hold():
+                send_all([(self._pipes[key], frame) for key, frame in series.items()])
+        else:
+            with METRICS.span("chart", "build"):
+                plot_view = self.create_plot_view(chart_data)
+            with METRICS.span("chart", "replace"):
+                self.view[-1] = plot_view
+
+    def stream_rows(self, rows):
+        """
+        Live: stream the new rows of every charted series into its Buffer.
+        Returns the number of rows streamed (rows of series the figure doesn't show don't count).
+        """
+        if not self.live_window or not self._pipes or rows.is_empty():
+            return 0
+        with METRICS.span("chart", "stream"):
+            grouped = group_arrays(rows, KEY_COLUMNS, ['date'] + list(CHART_CONFIG))
+            sends = []
+            streamed = 0
+            for group_keys, arrays in grouped.items():
+                group_sends = len(sends)
+                for col in self.selector.value:
+                    buffer = self._pipes.get((group_keys, col))
+                    if buffer is None:
+                        continue  # a series new to the figure appears on its next rebuild
+                    data = {'date': arrays['date'], col: arrays[col]}
+                    sends.append((buffer, pd.DataFrame(compact_arrays(data) if self.compact_wire else data)))
+                if len(sends) > group_sends:
+                    streamed += len(arrays['date'])
+            send_all(sends)
+        return streamed
 
 
 ###############################
-# 6) Additional Gallery View
+# 7) Additional Gallery View
 ###############################
+def embedded_bytes(filtered_data, filters, built):
+    """Cache size of a view `built` for a filters snapshot: the size of the frame it embeds."""
+    return filtered_data.frame(filters).estimated_size()
+
+
 class GalleryView(pn.viewable.Viewer):
     """
     A 'Gallery' tab of charts to showcase E, F, G, H in different ways.
     These charts also depend on the same filters.
     """
-    def __init__(self, df, filter_selectors):
-        self.df = df
+    def __init__(self, filtered_data, filter_selectors, compact_wire=False):
+        self.filtered_data = filtered_data
         self.filter_selectors = filter_selectors
+        self.compact_wire = compact_wire
 
-        # We'll build a grid of charts (2x2 for demonstration).
+        # We'll build a grid of charts (2x2 for demonstration), on first display.
         self.view = pn.Column(
-            self.build_gallery(),
+            loading_placeholder(),
             sizing_mode="stretch_both"
         )
+        self.builder = BackgroundBuild(self.view, "gallery")
 
-        # Watch the filters; rebuild charts if any filter changes
-        self.filter_selectors.region_selector.param.watch(self.update_gallery, 'value')
-        self.filter_selectors.C_selector.param.watch(self.update_gallery, 'value')
-        self.filter_selectors.D_selector.param.watch(self.update_gallery, 'value')
-        self.filter_selectors.A_selector.param.watch(self.update_gallery, 'value')
-        self.filter_selectors.date_range_picker.param.watch(self.update_gallery, 'value')
-
-    def build_gallery(self):
+    def build_gallery(self, filters=None):
         """
         Create a grid of different chart types: line, bar, histogram, scatter, etc.
+        for a filters snapshot (default: the current filters).
         """
-        filters = self.filter_selectors.get_filters()
-        filtered_df = self.df
-
-        if filters['region']:
-            filtered_df = filtered_df.filter(pl.col('region').is_in(filters['region']))
-        if filters['C']:
-            filtered_df = filtered_df.filter(pl.col('C').is_in(filters['C']))
-        if filters['D']:
-            filtered_df = filtered_df.filter(pl.col('D').is_in(filters['D']))
-        if filters['A']:
-            filtered_df = filtered_df.filter(pl.col('A').is_in(filters['A']))
-
-        date_start, date_end = filters['date_range']
-        if date_start and date_end:
-            filtered_df = filtered_df.filter(
-                (pl.col('date') >= pl.lit(date_start)) & (pl.col('date') <= pl.lit(date_end))
-            )
+        filters = self.filtered_data.filters() if filters is None else filters
+        filtered_df = self.filtered_data.frame(filters)
 
         if filtered_df.is_empty():
             return pn.pane.Markdown(
@@ -455,37 +1428,78 @@ class GalleryView(pn.viewable.Viewer):
                 css_classes=['no-data']
             )
 
-        df_pandas = filtered_df.to_pandas()
+        if self.compact_wire:
+            df_pandas = self.filtered_data.compact_pandas(filters)
+            date_opts = dict(xformatter=day_tick_formatter())
+        else:
+            df_pandas = self.filtered_data.pandas(filters)
+            date_opts = {}
+        mode = render_mode(len(df_pandas))
+
+        # The time series read the coarsest rollup level that still fills a gallery chart
+        level = self.filtered_data.rollup_level(GALLERY_CHART_WIDTH, filters)
+        rollup = self.filtered_data.rollup(level, filters)
+        bar_frame = select_aggregates(rollup, level, {'F': 'sum'}).group_by('date').agg(pl.col('F').sum())
+        with METRICS.span("gallery", "to_pandas"):
+            line_df = self.to_pandas(select_aggregates(rollup, level, {'E': 'mean'}), ['E'])
+            bar_df = self.to_pandas(bar_frame.sort('date'), ['F'])
+        line_mode = render_mode(len(line_df))
+        if self.compact_wire:
+            bar_opts = dict(date_opts, bar_width=day_bar_width(bar_df['date'].to_numpy()))
+        else:
+            bar_opts = date_opts
 
         # We’ll create four example charts:
-        chart1 = df_pandas.hvplot.line(
-            x='date', y='E', title="Line Chart of E over Time",
-            width=500, height=300, legend='top'
-        )
-        chart2 = df_pandas.hvplot.bar(
-            x='date', y='F', title="Bar Chart of F over Time",
-            width=500, height=300, legend='top'
-        )
-        chart3 = df_pandas.hvplot.hist(
-            y='G', bins=30, title="Histogram of G",
-            width=500, height=300, legend='top'
-        )
-        chart4 = df_pandas.hvplot.scatter(
-            x='E', y='H', title="Scatter of E vs. H",
-            width=500, height=300, legend='top'
-        )
+        with METRICS.span("gallery", "hvplot_line"):
+            chart1 = line_df.hvplot.line(
+                x='date', y='E', title="Line Chart of E over Time",
+                width=GALLERY_CHART_WIDTH, height=300, legend='top', **date_opts, **render_kwargs(line_mode)
+            )
+        with METRICS.span("gallery", "hvplot_bar"):
+            chart2 = bar_df.hvplot.bar(
+                x='date', y='F', title="Bar Chart of F over Time",
+                width=GALLERY_CHART_WIDTH, height=300, legend='top'
+            ).opts(**bar_opts)
+        with METRICS.span("gallery", "hvplot_hist"):
+            chart3 = df_pandas.hvplot.hist(
+                y='G', bins=30, title="Histogram of G",
+                width=GALLERY_CHART_WIDTH, height=300, legend='top'
+            )
+        with METRICS.span("gallery", "hvplot_scatter"):
+            chart4 = df_pandas.hvplot.scatter(
+                x='E', y='H', title="Scatter of E vs. H",
+                width=GALLERY_CHART_WIDTH, height=300, legend='top', **render_kwargs(mode)
+            )
 
         # Combine them in a 2x2 grid layout
         grid = pn.GridSpec(ncols=2, nrows=2, sizing_mode='stretch_both')
-        grid[0, 0] = chart1.opts(toolbar='above')
-        grid[0, 1] = chart2.opts(toolbar='above')
+        grid[0, 0] = apply_render_mode(chart1.opts(toolbar='above'), line_mode)
+        grid[0, 1] = apply_render_mode(chart2.opts(toolbar='above'), line_mode)
         grid[1, 0] = chart3.opts(toolbar='above')
-        grid[1, 1] = chart4.opts(toolbar='above')
+        grid[1, 1] = apply_render_mode(chart4.opts(toolbar='above'), mode)
 
         return grid
 
+    def to_pandas(self, frame, columns):
+        """Date and `columns` of a small rollup frame for hvplot, in the view's wire encoding."""
+        if self.compact_wire:
+            return compact_frame(frame, columns).to_pandas()
+        return frame.select(['date'] + columns).to_pandas(use_pyarrow_extension_array=True)
+
     def update_gallery(self, *events):
-        self.view[0] = self.build_gallery()
+        self.builder.submit(self.cached_gallery, self.show_gallery)
+
+    def cached_gallery(self):
+        filters = self.filtered_data.filters()
+        return self.filtered_data.cache.get_or_build(
+            ('gallery', self.filtered_data.key(filters), self.compact_wire),
+            partial(self.build_gallery, filters),
+            nbytes=partial(embedded_bytes, self.filtered_data, filters)
+        )
+
+    def show_gallery(self, gallery):
+        with METRICS.span("gallery", "replace"):
+            self.view[-1] = gallery
 
 
 class ExplorerView(pn.viewable.Viewer):
@@ -493,26 +1507,21 @@ class ExplorerView(pn.viewable.Viewer):
     A dynamic Explorer tab using hvplot.explorer.
     It only activates when all selectors have at least one selected item.
     """
-    def __init__(self, df, filter_selectors):
-        self.df = df
+    def __init__(self, filtered_data, filter_selectors):
+        self.filtered_data = filtered_data
         self.filter_selectors = filter_selectors
         self.view = pn.Column(
-            self.build_explorer(),
+            loading_placeholder(),
             sizing_mode="stretch_both"
         )
+        self.builder = BackgroundBuild(self.view, "explorer")
 
-        # Watch the filters; rebuild explorer if any filter changes
-        self.filter_selectors.region_selector.param.watch(self.update_explorer, 'value')
-        self.filter_selectors.C_selector.param.watch(self.update_explorer, 'value')
-        self.filter_selectors.D_selector.param.watch(self.update_explorer, 'value')
-        self.filter_selectors.A_selector.param.watch(self.update_explorer, 'value')
-        self.filter_selectors.date_range_picker.param.watch(self.update_explorer, 'value')
-
-    def build_explorer(self):
+    def build_explorer(self, filters=None):
         """
-        Generate an hvplot explorer view dynamically based on the selected filters.
+        Generate an hvplot explorer view dynamically based on a filters snapshot
+        (default: the current filters).
         """
-        filters = self.filter_selectors.get_filters()
+        filters = self.filtered_data.filters() if filters is None else filters
 
         # Check if all selectors have a selected value
         if not (filters['region'] and filters['C'] and filters['D'] and filters['A']):
@@ -522,21 +1531,8 @@ class ExplorerView(pn.viewable.Viewer):
                 sizing_mode="stretch_width"
             )
 
-        # Filter the DataFrame
-        filtered_df = self.df
-        if filters['region']:
-            filtered_df = filtered_df.filter(pl.col('region').is_in(filters['region']))
-        if filters['C']:
-            filtered_df = filtered_df.filter(pl.col('C').is_in(filters['C']))
-        if filters['D']:
-            filtered_df = filtered_df.filter(pl.col('D').is_in(filters['D']))
-        if filters['A']:
-            filtered_df = filtered_df.filter(pl.col('A').is_in(filters['A']))
-        date_start, date_end = filters['date_range']
-        if date_start and date_end:
-            filtered_df = filtered_df.filter(
-                (pl.col('date') >= pl.lit(date_start)) & (pl.col('date') <= pl.lit(date_end))
-            )
+        # Shared filtered frame (computed once per filter state)
+        filtered_df = self.filtered_data.frame(filters)
 
         if filtered_df.is_empty():
             return pn.pane.Markdown(
@@ -546,108 +1542,341 @@ class ExplorerView(pn.viewable.Viewer):
             )
 
         # Convert to pandas for hvplot.explorer
-        df_pandas = filtered_df.to_pandas()
+        df_pandas = self.filtered_data.pandas(filters)
 
         # Create an hvplot explorer
-        explorer = df_pandas.hvplot.explorer(
-            x='date',
-            y=['E', 'F', 'G', 'H'],
-            groupby=['region', 'C', 'D', 'A'],
-            height=600,
-            width=1000
-        )
+        with METRICS.span("explorer", "hvplot_explorer"):
+            explorer = df_pandas.hvplot.explorer(
+                x='date',
+                y=['E', 'F', 'G', 'H'],
+                groupby=['region', 'C', 'D', 'A'],
+                height=600,
+                width=1000
+            )
         return explorer
 
     def update_explorer(self, *events):
-        self.view[0] = self.build_explorer()
+        self.builder.submit(self.cached_explorer, self.show_explorer)
+
+    def cached_explorer(self):
+        filters = self.filtered_data.filters()
+        return self.filtered_data.cache.get_or_build(
+            ('explorer', self.filtered_data.key(filters)), partial(self.build_explorer, filters),
+            nbytes=partial(embedded_bytes, self.filtered_data, filters)
+        )
+
+    def show_explorer(self, explorer):
+        with METRICS.span("explorer", "replace"):
+            self.view[-1] = explorer
+
+
+# How often the admin tab re-reads the metrics while it is shown
+METRICS_REFRESH_MS = 2000
+
+METRICS_COLUMNS = ["view", "step", "unit", "count", "mean", "p50", "p99"]
+
+
+class MetricsView(pn.viewable.Viewer):
+    """
+    Optional admin tab: this process's hot-path span timings (ms) and websocket
+    payload sizes (bytes) per view and step, from the METRICS histograms.
+    """
+    def __init__(self):
+        self.table = pn.widgets.Tabulator(
+            value=pd.DataFrame(columns=METRICS_COLUMNS),
+            show_index=False,
+            disabled=True,
+            sizing_mode="stretch_width"
+        )
+        self.view = pn.Column(self.table, sizing_mode="stretch_both")
+
+    def refresh(self, *events):
+        rows = pd.DataFrame(METRICS.snapshot(), columns=METRICS_COLUMNS)
+        self.table.value = rows.round({"mean": 2, "p50": 2, "p99": 2})
 
 
 ###############################
-# 7) Updated Dashboard
+# 8) Updated Dashboard
 ###############################
+# Budget of the per-session cache of built view objects
+SESSION_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
 class Dashboard:
-    def __init__(self, df):
-        self.filter_selectors = FilterSelectors(df, on_change=self.on_filter_change)
-        self.chart_view = ChartView(df, self.filter_selectors)
-        self.table_view = TableView(df, self.filter_selectors)
-        self.gallery_view = GalleryView(df, self.filter_selectors)
-        self.explorer_view = ExplorerView(df, self.filter_selectors)
+    """
+    `source` is a PartitionIndex over an in-memory frame, or an out-of-core
+    LazyFrameSource from scan_parquet_source/scan_ipc_source.
+
+    Pass a `data_cache` to share filtered frames between dashboards (sessions);
+    built view objects always stay in the dashboard's own `cache`; pass the source's
+    `rollups` (RollupCube) to share them too. `admin` adds a Metrics tab;
+    `compact_wire` sends chart data in the compact wire encoding.
 
+    With a `live_hub` (LiveHub), the session subscribes to the live feed: the chart
+    and table follow it, and each batch of new rows is streamed into whichever of
+    them is shown (push_live).
+    """
+    def __init__(self, source, data_cache=None, cache_max_bytes=SESSION_CACHE_MAX_BYTES, admin=False,
+                 compact_wire=False, rollups=None, live_hub=None, live_window=LIVE_WINDOW_DAYS):
+        self.index = source
+        self.cache = ViewCache(cache_max_bytes)
+        self.data_cache = data_cache if data_cache is not None else self.cache
+        self.filter_selectors = FilterSelectors(self.index, on_change=self.on_filter_change)
+        self.filtered_data = FilteredData(
+            self.index, self.filter_selectors, self.cache, self.data_cache, rollups=rollups
+        )
+        live = live_hub is not None
+        self.chart_view = ChartView(
+            self.filtered_data, self.filter_selectors, compact_wire=compact_wire,
+            live_window=live_window if live else None
+        )
+        self.table_view = TableView(
+            self.filtered_data, self.filter_selectors, live_rows=LIVE_TABLE_ROWS if live else None
+        )
+        self.gallery_view = GalleryView(self.filtered_data, self.filter_selectors, compact_wire=compact_wire)
+        self.explorer_view = ExplorerView(self.filtered_data, self.filter_selectors)
+
+        # dynamic=True: the browser only renders the active tab
         self.tabs = pn.Tabs(
             ("Charts", self.chart_view.view),
             ("Table", self.table_view.view),
             ("Gallery", self.gallery_view.view),
             ("Explorer", self.explorer_view.view),
+            dynamic=True,
             sizing_mode="stretch_both"
         )
 
+        # Update callback per tab; hidden tabs are only marked dirty and
+        # recompute when the user switches to them.
+        self._tab_updates = [
+            self.chart_view.update_charts,
+            self.table_view.update_table,
+            self.gallery_view.update_gallery,
+            self.explorer_view.update_explorer,
+        ]
+
+        self._data_tabs = set(range(len(self._tab_updates)))
+
+        self.metrics_view = None
+        if admin:
+            self.metrics_view = MetricsView()
+            self.tabs.append(("Metrics", self.metrics_view.view))
+            self._tab_updates.append(self.metrics_view.refresh)
+
+        self._dirty = set(range(1, len(self._tab_updates)))
+        self.tabs.param.watch(self.on_tab_change, 'active')
+
+        self.cache_info = pn.pane.Str("", css_classes=['no-data'], sizing_mode="stretch_width")
+
+        self.live_hub = live_hub
+        self._live_pending = []
+        self._live_lock = threading.Lock()
+        self._live_rows = 0
+        self._live_started = time.perf_counter()
+        self._doc = pn.state.curdoc
+        if live:
+            live_hub.subscribe(self.on_live_rows)
+            if self._doc is not None and self._doc.session_context is not None:
+                self._doc.on_session_destroyed(lambda session_context: live_hub.unsubscribe(self.on_live_rows))
+
     def on_filter_change(self):
-        self.chart_view.update_charts()
-        self.table_view.update_table()
+        # The single (debounced) notification per user action
+        self._dirty = set(range(len(self._tab_updates)))
+        self.update_active_tab()
+
+    def on_tab_change(self, event):
+        self.update_active_tab()
+
+    def update_active_tab(self):
+        active = self.tabs.active
+        if active in self._dirty:
+            self._dirty.discard(active)
+            self._tab_updates[active]()
+        self.update_cache_info()
+
+    def update_cache_info(self):
+        caches = [("cache", self.cache)]
+        if self.data_cache is not self.cache:
+            caches = [("data cache", self.data_cache), ("view cache", self.cache)]
+
+        lines = []
+        for name, cache in caches:
+            stats = cache.stats()
+            lines.append(
+                f"{name}: {stats['hits']} hits / {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), {stats['entries']} entries, "
+                f"{stats['bytes'] / 2**20:.1f} of {stats['max_bytes'] / 2**20:.0f} MiB"
+            )
+        if self.live_hub is not None:
+            elapsed = time.perf_counter() - self._live_started
+            lines.append(f"live: {self._live_rows:,} rows pushed, {self._live_rows / elapsed:,.1f} rows/s")
+        self.cache_info.object = " | ".join(lines)
+
+    def on_live_rows(self, rows):
+        """
+        LiveHub callback, on the hub's thread: queue the rows for this session's event
+        loop. Batches arriving before the session gets to them are pushed as one.
+        """
+        doc = self._doc
+        if doc is None or doc.session_context is None:
+            self.push_live(rows)
+            return
+        with self._live_lock:
+            schedule = not self._live_pending
+            self._live_pending.append(rows)
+        if schedule:
+            doc.add_next_tick_callback(partial(self._push_pending, doc))
+
+    def _push_pending(self, doc):
+        with self._live_lock:
+            pending, self._live_pending = self._live_pending, []
+        with set_curdoc(doc):
+            self.push_live(pl.concat(pending))
+
+    def push_live(self, rows):
+        """
+        Stream the rows of the selected series into the shown chart or table, and
+        mark the other data tabs stale (they rebuild, with the new rows, when shown).
+        The session's push throughput, counting the rows a view actually streamed, is
+        recorded as live "rows_per_s".
+        """
+        rows = self.filtered_data.matching(rows)
+        active = self.tabs.active
+        started = time.perf_counter()
+        streamed = 0
+        if active == 0:
+            with payload_view("chart"), pn.io.hold():
+                streamed = self.chart_view.stream_rows(rows)
+        elif active == 1:
+            with payload_view("table"), pn.io.hold():
+                streamed = self.table_view.stream_rows(rows)
+        elapsed = time.perf_counter() - started
+        METRICS.observe("live", "push", elapsed * 1000)
+        if streamed:
+            METRICS.observe("live", "rows_per_s", streamed / elapsed, unit="rows_per_s")
+
+        self._dirty |= self._data_tabs - {active}
+        self._live_rows += streamed
+        self.update_cache_info()
+
+    def refresh_metrics(self):
+        """Periodic callback: re-read the metrics while the admin tab is shown."""
+        if self.metrics_view is not None and self.tabs.active == len(self.tabs) - 1:
+            self.metrics_view.refresh()
 
 ###############################
-# 8) main()
+# 9) main()
 ###############################
-def main():
-    df_polars = generate_full_df()
-    dashboard = Dashboard(df_polars)
+def load_source(args):
+    if args.parquet:
+        return scan_parquet_source(args.parquet, hive_partitioned=args.hive)
+    if args.ipc and args.mmap:
+        return mmap_ipc_source(args.ipc)
+    if args.ipc:
+        return scan_ipc_source(args.ipc)
+    return PartitionIndex(generate_full_df())
 
-    CUSTOM_CSS = """
-    body, .bk-root {
-      background-color: #1e1e1e !important;
-      color: #e0e0e0 !important;
-    }
-    .bk.bk-tabs-header {
-      background-color: #2e2e2e !important;
-      color: #fff !important;
-      font-weight: 600;
-    }
-    .selectors-row {
-      background-color: #292929 !important;
-      border-bottom: 2px solid #444 !important;
-      margin: 0 !important;
-      padding: 10px !important;
-    }
-    .selectors-row .bk-input-group {
-      margin-right: 10px !important;
-    }
-    .bk.bk-input-group input {
-        background-color: #3a3a3a !important;
-        color: #e0e0e0 !important;
-    }
-    .bk.bk-input-group .bk-btn-default {
-        background-color: #3a3a3a !important;
-        color: #ddd !important;
-        border-color: #555 !important;
-    }
-    .tabulator {
-      background-color: #333 !important;
-      color: #e0e0e0 !important;
-    }
-    .tabulator .tabulator-header {
-      background-color: #3a3a3a !important;
-    }
-    .no-data {
-      font-size: 1.2em;
-      color: #bbb !important;
-      text-align: center;
-      padding: 20px !important;
-    }
-    .chart-panel {
-      background-color: #2a2a2a !important;
-      border-radius: 4px !important;
-      padding: 10px !important;
-    }
-    .scrollable-charts {
-      overflow-y: auto;
-      overflow-x: hidden;
-      height: 600px;
-    }
-    .bk .bk-legend {
-      max-height: 300px !important;
-      overflow-y: auto !important;
-    }
+
+def write_shared_dataset(path):
+    """
+    Generate the default dataset into an Arrow IPC file for the worker processes to map.
+
+    Runs in a spawned interpreter so the server process never starts polars' thread
+    pool before forking its workers.
+    """
+    writer = multiprocessing.get_context("spawn").Process(
+        target=write_generated_dataset, args=(path,), kwargs={"file_format": "ipc"}
+    )
+    writer.start()
+    writer.join()
+    if writer.exitcode != 0:
+        raise RuntimeError(f"Writing the shared dataset to {path} failed")
+    return path
+
+
+# (source, rollups, data_cache) per process id: each forked worker loads its own on first use
+_PROCESS_STATE = {}
+
+
+def process_state(args):
+    pid = os.getpid()
+    if pid not in _PROCESS_STATE:
+        source = load_source(args)
+        _PROCESS_STATE[pid] = (source, RollupCube(source), ViewCache(args.cache_mb * 2**20))
+    return _PROCESS_STATE[pid]
+
+
+CUSTOM_CSS = """
+body, .bk-root {
+  background-color: #1e1e1e !important;
+  color: #e0e0e0 !important;
+}
+.bk.bk-tabs-header {
+  background-color: #2e2e2e !important;
+  color: #fff !important;
+  font-weight: 600;
+}
+.selectors-row {
+  background-color: #292929 !important;
+  border-bottom: 2px solid #444 !important;
+  margin: 0 !important;
+  padding: 10px !important;
+}
+.selectors-row .bk-input-group {
+  margin-right: 10px !important;
+}
+.bk.bk-input-group input {
+    background-color: #3a3a3a !important;
+    color: #e0e0e0 !important;
+}
+.bk.bk-input-group .bk-btn-default {
+    background-color: #3a3a3a !important;
+    color: #ddd !important;
+    border-color: #555 !important;
+}
+.tabulator {
+  background-color: #333 !important;
+  color: #e0e0e0 !important;
+}
+.tabulator .tabulator-header {
+  background-color: #3a3a3a !important;
+}
+.no-data {
+  font-size: 1.2em;
+  color: #bbb !important;
+  text-align: center;
+  padding: 20px !important;
+}
+.chart-panel {
+  background-color: #2a2a2a !important;
+  border-radius: 4px !important;
+  padding: 10px !important;
+}
+.scrollable-charts {
+  overflow-y: auto;
+  overflow-x: hidden;
+  height: 600px;
+}
+.bk .bk-legend {
+  max-height: 300px !important;
+  overflow-y: auto !important;
+}
+"""
+
+
+def create_app(source, data_cache=None, admin=False, compact_wire=False, rollups=None,
+               live_hub=None, live_window=LIVE_WINDOW_DAYS):
+    """
+    Build one session's dashboard and template. `source` (and its indexes), its
+    `rollups`, `data_cache` and `live_hub` are shared by every session; only widget
+    and view state is created per session.
     """
+    dashboard = Dashboard(
+        source, data_cache=data_cache, admin=admin, compact_wire=compact_wire, rollups=rollups,
+        live_hub=live_hub, live_window=live_window
+    )
+    if admin:
+        pn.state.add_periodic_callback(dashboard.refresh_metrics, period=METRICS_REFRESH_MS)
 
     template = pn.template.BootstrapTemplate(
         title='Cool Dark Dashboard',
@@ -660,11 +1889,74 @@ def main():
         pn.Column(
             dashboard.filter_selectors.view,
             dashboard.tabs,
+            dashboard.cache_info,
             sizing_mode='stretch_both'
         )
     )
+    return template
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cool Dark Dashboard")
+    parser.add_argument("--parquet", help="Parquet file or dataset directory to scan lazily")
+    parser.add_argument("--hive", action="store_true", help="--parquet is hive-partitioned by region/C/D")
+    parser.add_argument("--ipc", help="Arrow IPC file to memory-map and scan lazily")
+    parser.add_argument("--mmap", action="store_true",
+                        help="Map --ipc (as written by write_generated_dataset) into an in-memory index")
+    parser.add_argument("--num-procs", type=int, default=1,
+                        help="Server worker processes; >1 shares one memory-mapped dataset between them")
+    parser.add_argument("--dataset-path", default=os.path.join(tempfile.gettempdir(), "cool-view-dataset.arrow"),
+                        help="Where --num-procs writes the generated dataset when no --parquet/--ipc is given")
+    parser.add_argument("--cache-mb", type=int, default=VIEW_CACHE_MAX_BYTES // 2**20,
+                        help="Memory budget of the data cache shared by all sessions of a process, in MiB")
+    parser.add_argument("--admin", action="store_true", help="Add a Metrics tab with the hot-path timings")
+    parser.add_argument("--compact-wire", action="store_true",
+                        help="Send chart data as float32 values and integer epoch-day dates")
+    parser.add_argument("--live", action="store_true",
+                        help="Append a new day per series from a local feed and stream it to charts and tables")
+    parser.add_argument("--live-interval-ms", type=int, default=LIVE_INTERVAL_MS, help="Live feed tick interval")
+    parser.add_argument("--live-window", type=int, default=LIVE_WINDOW_DAYS,
+                        help="Days per series kept by the live charts")
+    args = parser.parse_args()
+
+    if args.live and (args.num_procs > 1 or args.parquet or (args.ipc and not args.mmap)):
+        parser.error("--live appends to an in-memory dataset in a single process")
+
+    if args.num_procs > 1 and not (args.parquet or args.ipc):
+        args.ipc = write_shared_dataset(args.dataset_path)
+        args.mmap = True
+
+    if args.num_procs == 1:
+        # Load before serving so the first session doesn't wait for it
+        process_state(args)
+
+    live_hub = None
+    if args.live:
+        source, rollups, _ = process_state(args)
+        feed = LiveFeed(
+            source.keys(), source.date_range()[1] + timedelta(days=1), interval_ms=args.live_interval_ms
+        )
+        live_hub = LiveHub(source, rollups, feed)
+        live_hub.start()
+
+    # A plain function (Panel renders a functools.partial as an object instead of
+    # calling it), so every browser session gets a fresh dashboard; with num_procs > 1
+    # each forked worker loads (maps) the source on its first session
+    def session_app():
+        source, rollups, data_cache = process_state(args)
+        return create_app(
+            source, data_cache, admin=args.admin, compact_wire=args.compact_wire, rollups=rollups,
+            live_hub=live_hub, live_window=args.live_window
+        )
 
-    pn.serve(template, port=5006, show=True)
+    # Timings and payload sizes, as text for local scrapers at /metrics (per process)
+    instrument_websocket()
+    try:
+        pn.serve(session_app, port=5006, num_procs=args.num_procs, show=args.num_procs == 1,
+                 extra_patterns=[(r"/metrics", MetricsHandler)])
+    finally:
+        if live_hub is not None:
+            live_hub.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,187 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import numpy as np
+from tornado.web import RequestHandler
+
+# Histogram bucket upper bounds per unit (the last bucket is +Inf)
+BUCKETS = {
+    "ms": [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000],
+    "bytes": [2**10, 2**12, 2**14, 2**16, 2**18, 2**20, 2**22, 2**24, 2**26],
+    "rows_per_s": [10, 100, 1000, 10**4, 10**5, 10**6, 10**7],
+}
+
+# Exported metric name per unit
+METRIC_NAMES = {
+    "ms": "coolview_span_ms",
+    "bytes": "coolview_payload_bytes",
+    "rows_per_s": "coolview_throughput_rows_per_s",
+}
+
+# Recent samples kept per histogram for the p50 / p99 estimates
+RECENT_SAMPLES = 2048
+
+QUANTILES = (0.5, 0.99)
+
+
+###############################
+# 1) Histograms
+###############################
+class Histogram:
+    """Cumulative bucket counts plus a window of recent samples for quantiles."""
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, value):
+        self.bucket_counts[np.searchsorted(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def quantiles(self):
+        if not self.recent:
+            return {q: 0.0 for q in QUANTILES}
+        values = np.quantile(np.fromiter(self.recent, float), QUANTILES)
+        return dict(zip(QUANTILES, values.tolist()))
+
+
+class Metrics:
+    """
+    Per-view histograms of hot-path spans (ms), payload sizes (bytes) and live
+    throughput (rows/s), keyed by (unit, view, step). Safe to record from the
+    view-build threads.
+    """
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, view, step, value, unit="ms"):
+        with self._lock:
+            histogram = self._histograms.get((unit, view, step))
+            if histogram is None:
+                histogram = self._histograms[(unit, view, step)] = Histogram(BUCKETS[unit])
+            histogram.observe(value)
+
+    @contextmanager
+    def span(self, view, step):
+        """Time the body of the `with` block as one `step` of `view`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(view, step, (time.perf_counter() - start) * 1000)
+
+    def snapshot(self):
+        """One row per histogram: unit, view, step, count, mean, p50, p99."""
+        with self._lock:
+            rows = []
+            for (unit, view, step), histogram in sorted(self._histograms.items()):
+                quantiles = histogram.quantiles()
+                rows.append({
+                    "unit": unit,
+                    "view": view,
+                    "step": step,
+                    "count": histogram.count,
+                    "mean": histogram.sum / histogram.count,
+                    "p50": quantiles[0.5],
+                    "p99": quantiles[0.99],
+                })
+            return rows
+
+    def render_text(self):
+        """The histograms in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for unit in BUCKETS:
+                name = METRIC_NAMES[unit]
+                histograms = sorted(
+                    (key[1:], histogram) for key, histogram in self._histograms.items() if key[0] == unit
+                )
+                if not histograms:
+                    continue
+
+                lines.append(f"# TYPE {name} histogram")
+                for (view, step), histogram in histograms:
+                    labels = f'view="{view}",step="{step}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds + ["+Inf"], histogram.bucket_counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.3f}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+                lines.append(f"# TYPE {name}_quantile gauge")
+                for (view, step), histogram in histograms:
+                    for q, value in histogram.quantiles().items():
+                        lines.append(f'{name}_quantile{{view="{view}",step="{step}",quantile="{q}"}} {value:.3f}')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry every view records into
+METRICS = Metrics()
+
+# The view whose update is being applied (see payload_view); Bokeh messages created
+# meanwhile are recorded against it, the others against "websocket"
+_PAYLOAD_VIEW = ContextVar("payload_view", default="websocket")
+
+
+@contextmanager
+def payload_view(view):
+    """Attribute the Bokeh messages created in the `with` block to `view` (see instrument_websocket)."""
+    token = _PAYLOAD_VIEW.set(view)
+    try:
+        yield
+    finally:
+        _PAYLOAD_VIEW.reset(token)
+
+
+###############################
+# 2) Exporters
+###############################
+class MetricsHandler(RequestHandler):
+    """GET /metrics: METRICS as plain text, served to loopback clients only."""
+    def get(self):
+        if self.request.remote_ip not in ("127.0.0.1", "::1"):
+            self.set_status(403)
+            return
+        self.set_header("Content-Type", "text/plain; version=0.0.4")
+        self.write(METRICS.render_text())
+
+
+def message_bytes(message):
+    """Bytes a Bokeh protocol message puts on the websocket: its JSON parts and binary buffers."""
+    size = len(message.header_json) + len(message.metadata_json) + len(message.content_json)
+    for buffer in message.buffers:
+        data = buffer.data
+        size += len(json.dumps(buffer.ref)) + (data.nbytes if isinstance(data, memoryview) else len(data))
+    return size
+
+
+def instrument_websocket(metrics=METRICS):
+    """
+    Record the size of every Bokeh protocol message created for a browser, per view and
+    message type. A message belongs to the view being updated (payload_view) when the
+    document change producing it was made. Sizes are taken when a message is created,
+    since Panel writes its PATCH-DOC messages to the socket itself (not via Message.send).
+    """
+    from bokeh.protocol import Protocol
+
+    create = Protocol.create
+    if getattr(create, "instrumented", False):
+        return
+
+    def create_and_record(protocol, msgtype, *args, **kwargs):
+        message = create(protocol, msgtype, *args, **kwargs)
+        metrics.observe(_PAYLOAD_VIEW.get(), msgtype, message_bytes(message), unit="bytes")
+        return message
+
+    create_and_record.instrumented = True
+    Protocol.create = create_and_record
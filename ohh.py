@@ -24,8 +24,8 @@ def app():
     # 1. Create Polars DataFrame
     df = create_polars_df()
 
-    # 2. Convert to Pandas for hvplot
-    df_pd = df.to_pandas()
+    # 2. Arrow-backed Pandas for hvplot (shares Polars' buffers instead of copying)
+    df_pd = df.to_pandas(use_pyarrow_extension_array=True)
 
     # 3. Plot PnL with hvplot
     line_plot = df_pd.hvplot.line(
@@ -37,8 +37,8 @@ def create_polars_df(num_ids=3):
 # 1. Create a Polars DataFrame with multiple IDs
 df = create_polars_df(num_ids=4)
 
-# 2. Convert to Pandas for hvplot
-df_pd = df.to_pandas()
+# 2. Arrow-backed Pandas for hvplot (shares Polars' buffers instead of copying)
+df_pd = df.to_pandas(use_pyarrow_extension_array=True)
 
 # A MultiSelect widget to pick which IDs to show
 unique_ids = df_pd["id"].unique().tolist()
@@ -0,0 +1,168 @@
+from datetime import datetime
+
+import polars as pl
+
+from data_index import KEY_COLUMNS, PartitionIndex
+
+VALUE_COLUMNS = ["E", "F", "G", "H"]
+
+AGGREGATIONS = ["sum", "mean", "min", "max", "last"]
+
+# Rollup levels, finest first: (name, polars duration of one bucket, approx. days per bucket).
+# "daily" is the source itself, which already holds one row per series and day.
+ROLLUP_LEVELS = [
+    ("daily", "1d", 1),
+    ("weekly", "1w", 7),
+    ("monthly", "1mo", 30),
+    ("quarterly", "1q", 91),
+]
+
+LEVEL_EVERY = {name: every for name, every, _ in ROLLUP_LEVELS}
+
+# A chart is given about one point per PIXELS_PER_POINT pixels of its width
+PIXELS_PER_POINT = 16
+
+
+def rollup_column(column, agg):
+    return f"{column}_{agg}"
+
+
+def aggregate(column, agg):
+    # "last" is the value of the latest day, so the rows needn't come in date order
+    expr = pl.col(column).max_by("date") if agg == "last" else getattr(pl.col(column), agg)()
+    return expr.alias(rollup_column(column, agg))
+
+
+def build_rollup(lazy_frame, every):
+    """
+    Aggregate every series into `every` calendar buckets, labelled by their first day,
+    with the number of daily `rows` in each. A plain group-by on the bucket: the rows
+    may come in any order, and the streaming engine runs it over a scan in bounded memory.
+    """
+    bucket = pl.col("date").dt.truncate(every).alias("bucket")
+    return lazy_frame.with_columns(bucket).group_by(KEY_COLUMNS + ["bucket"]).agg(
+        [pl.len().alias("rows")]
+        + [aggregate(col, agg) for col in VALUE_COLUMNS for agg in AGGREGATIONS]
+    ).rename({"bucket": "date"})
+
+
+def merge_buckets(frame):
+    """
+    Combine the rows of a rollup frame that aggregate parts of the same (series, bucket),
+    in row order (so "last" comes from the latest part); the mean is re-derived from
+    the sum and row count.
+    """
+    merged = frame.group_by(KEY_COLUMNS + ["date"], maintain_order=True).agg(
+        [pl.col("rows").sum()]
+        + [
+            getattr(pl.col(rollup_column(col, agg)), agg)()
+            for col in VALUE_COLUMNS for agg in AGGREGATIONS if agg != "mean"
+        ]
+    )
+    return merged.with_columns([
+        (pl.col(rollup_column(col, "sum")) / pl.col("rows")).alias(rollup_column(col, "mean"))
+        for col in VALUE_COLUMNS
+    ]).select(frame.columns)
+
+
+def bucket_start(date, level):
+    """First day of the `level` bucket holding `date`."""
+    return pl.select(pl.lit(date).dt.truncate(LEVEL_EVERY[level])).item()
+
+
+def select_aggregates(frame, level, aggregations):
+    """
+    The key columns, date and one aggregate per value column ({column: agg}) of a
+    `level` frame, named after the value column so every level reads the same.
+    """
+    if level == "daily":
+        return frame.select(KEY_COLUMNS + ["date"] + list(aggregations))
+    return frame.select(
+        KEY_COLUMNS + ["date"]
+        + [pl.col(rollup_column(col, agg)).alias(col) for col, agg in aggregations.items()]
+    )
+
+
+class RollupCube:
+    """
+    Weekly, monthly and quarterly sum / mean / min / max / last of E..H per series,
+    materialized once when the source (in memory or a scan) is loaded and kept
+    current by update().
+
+    Each level is a PartitionIndex of its own, so filtering a level costs the same
+    binary searches as filtering the source, over 7-91x fewer rows. Views ask
+    level_for() which level still gives them enough points and read it with filter().
+    """
+    def __init__(self, source):
+        self.source = source
+        self.date_range = tuple(
+            value.date() if isinstance(value, datetime) else value for value in source.date_range()
+        )
+        # One streaming pass per level over the source (a scan is never read in whole);
+        # only the much smaller levels are materialized
+        lazy_frame = source.lazy()
+        levels = pl.collect_all(
+            [build_rollup(lazy_frame, every) for _, every, _ in ROLLUP_LEVELS[1:]], engine="streaming"
+        )
+        self.levels = {
+            name: PartitionIndex(level) for (name, _, _), level in zip(ROLLUP_LEVELS[1:], levels)
+        }
+
+    def update(self, changed):
+        """
+        Fold rows appended to the source, given as {series key: first appended date}
+        (see PartitionIndex.append), into every level. Only the new rows are
+        aggregated; a stored bucket they fall into is merged with them and replaced,
+        in the same append that adds the new buckets.
+        """
+        if not changed:
+            return
+        new_rows = self.source.appended_rows(changed)
+
+        for name, index in self.levels.items():
+            buckets = build_rollup(new_rows.lazy(), LEVEL_EVERY[name]).collect()
+            starts = {}  # the changed series usually share their first date
+            stored, replace = [], {}
+            for key, first_date in changed.items():
+                if first_date not in starts:
+                    starts[first_date] = bucket_start(first_date, name)
+                last = index.last_row(key)
+                if last is not None and last["date"] >= starts[first_date]:
+                    stored.append(last)
+                    replace[key] = last["date"]
+            if stored:
+                buckets = merge_buckets(pl.concat([pl.DataFrame(stored, schema=index.df.schema), buckets]))
+            index.append(buckets, replace=replace)
+
+        min_date, max_date = self.date_range
+        self.date_range = (min_date, max(max_date, new_rows["date"].max().date()))
+
+    def version(self, level, filters):
+        """The append versions of a level's series matching the filters, for cache keys."""
+        if level == "daily":
+            return self.source.version(filters)
+        return self.levels[level].version(filters)
+
+    def level_for(self, date_range, width):
+        """
+        The coarsest level with at least `width` / PIXELS_PER_POINT buckets in
+        `date_range` (clipped to the data; None = all dates).
+        """
+        min_date, max_date = self.date_range
+        start, end = date_range or (min_date, max_date)
+        span_days = (min(end, max_date) - max(start, min_date)).days + 1
+
+        for name, _, bucket_days in reversed(ROLLUP_LEVELS):
+            if span_days / bucket_days >= width / PIXELS_PER_POINT:
+                return name
+        return "daily"
+
+    def filter(self, level, filters):
+        """Rows of `level` for the filters; buckets overlapping the date range are kept whole."""
+        if level == "daily":
+            return self.source.filter(filters)
+
+        date_start, date_end = filters['date_range'] or (None, None)
+        if date_start and date_end:
+            filters = {**filters, 'date_range': (bucket_start(date_start, level), date_end)}
+        return self.levels[level].filter(filters)
@@ -0,0 +1,127 @@
+from datetime import date, datetime, timedelta
+
+import polars as pl
+import pytest
+
+from data_index import KEY_COLUMNS, HierarchyIndex, PartitionIndex
+
+KEYS = [
+    ("North", "C1", "D1", "A1"),
+    ("North", "C1", "D2", "A2"),
+    ("South", "C2", "D1", "A1"),
+]
+START = datetime(2024, 1, 1)
+
+
+def daily_rows(keys, start, days, value=1.0):
+    """`days` rows per series from `start`, with E..H all `value`, newest series first."""
+    return pl.DataFrame(
+        [
+            (*key, start + timedelta(days=day), value, value, value, value)
+            for key in reversed(keys) for day in range(days)
+        ],
+        schema=KEY_COLUMNS + ["date", "E", "F", "G", "H"],
+        orient="row",
+    )
+
+
+def no_filters(**filters):
+    return {**{col: [] for col in KEY_COLUMNS}, "date_range": None, **filters}
+
+
+def sorted_rows(frame):
+    return frame.sort(KEY_COLUMNS + ["date"])
+
+
+@pytest.fixture
+def index():
+    return PartitionIndex(daily_rows(KEYS, START, 10))
+
+
+def test_filter_selects_series_and_date_range(index):
+    filters = no_filters(A=["A1"], date_range=(date(2024, 1, 3), date(2024, 1, 5)))
+    expected = index.df.filter(
+        pl.col("A") == "A1", pl.col("date").is_between(datetime(2024, 1, 3), datetime(2024, 1, 5))
+    )
+    assert sorted_rows(index.filter(filters)).equals(sorted_rows(expected))
+
+
+def test_filter_without_selection_returns_every_row(index):
+    assert index.filter(no_filters()).height == 30
+    assert index.filter(no_filters(region=["East"])).is_empty()
+
+
+def test_date_bounds_binary_searches_inside_a_run(index):
+    start, end = index.partitions[KEYS[0]][0]
+    assert PartitionIndex.date_bounds(index.df, start, end) == (start, end)
+    assert PartitionIndex.date_bounds(
+        index.df, start, end, date(2024, 1, 3), date(2024, 1, 5)
+    ) == (start + 2, start + 5)
+    # A range outside the run leaves an empty slice
+    lo, hi = PartitionIndex.date_bounds(index.df, start, end, date(2025, 1, 1), date(2025, 2, 1))
+    assert lo == hi
+
+
+def test_append_adds_runs_cumulates_and_bumps_versions(index):
+    changed = index.append(daily_rows(KEYS[:1], START + timedelta(days=10), 2), cumulative=["G", "H"])
+
+    assert changed == {KEYS[0]: START + timedelta(days=10)}
+    assert len(index.partitions[KEYS[0]]) == 2
+    assert index.versions == {KEYS[0]: 1}
+    rows = index.filter(no_filters(A=["A1"], D=["D1"], region=["North"]))
+    assert rows.height == 12
+    # G/H continue from the last stored value; E/F are stored as given
+    assert rows["G"].tail(2).to_list() == [2.0, 3.0]
+    assert rows["E"].tail(2).to_list() == [1.0, 1.0]
+
+
+def test_append_accepts_new_series_and_rejects_stale_dates(index):
+    new_key = ("West", "C3", "D3", "A9")
+    index.append(daily_rows([new_key], START, 3))
+    assert new_key in index.keys()
+    assert "West" in index.hierarchy.options("region", no_filters())
+
+    with pytest.raises(ValueError):
+        index.append(daily_rows(KEYS[:1], START + timedelta(days=9), 1))
+
+
+def test_truncate_drops_rows_from_date(index):
+    index.truncate(KEYS[0], START + timedelta(days=4))
+
+    assert index.last_row(KEYS[0])["date"] == START + timedelta(days=3)
+    assert index.filter(no_filters(A=["A1"], region=["North"])).height == 4
+
+
+def test_append_replace_swaps_rows_in_one_step(index):
+    replace_from = START + timedelta(days=8)
+    index.append(daily_rows(KEYS[:1], replace_from, 3, value=5.0), replace={KEYS[0]: replace_from})
+
+    rows = index.filter(no_filters(A=["A1"], region=["North"]))
+    assert rows.height == 11
+    assert rows["E"].to_list() == [1.0] * 8 + [5.0] * 3
+
+    with pytest.raises(ValueError):
+        index.append(daily_rows(KEYS[:1], START, 1), replace={KEYS[0]: START + timedelta(days=1)})
+
+
+def test_compact_keeps_rows_after_appends_and_truncates(index):
+    index.append(daily_rows(KEYS, START + timedelta(days=10), 2))
+    index.truncate(KEYS[1], START + timedelta(days=5))
+    expected = sorted_rows(index.filter(no_filters()))
+
+    index.compact()
+
+    assert all(len(runs) == 1 for runs in index.partitions.values())
+    assert index.df.height == expected.height
+    assert sorted_rows(index.filter(no_filters())).equals(expected)
+
+
+def test_hierarchy_options_cascade_from_selections_above():
+    hierarchy = HierarchyIndex(KEYS)
+
+    assert hierarchy.options("region", no_filters()) == ["North", "South"]
+    assert hierarchy.options("D", no_filters(region=["North"])) == ["D1", "D2"]
+    assert hierarchy.options("A", no_filters(region=["North"], D=["D2"])) == ["A2"]
+    # Selections below a column don't narrow it
+    assert hierarchy.options("C", no_filters(A=["A2"])) == ["C1", "C2"]
+    assert hierarchy.options("A", no_filters(region=["East"])) == []
@@ -0,0 +1,47 @@
+from datetime import date, datetime
+
+import polars as pl
+
+from data_index import KEY_COLUMNS
+from data_sources import LazyFrameSource, build_filter_predicate
+
+FRAME = pl.DataFrame({
+    "region": ["North", "North", "South"],
+    "C": ["C1", "C1", "C2"],
+    "D": ["D1", "D1", "D2"],
+    "A": ["A1", "A2", "A1"],
+    "date": [datetime(2024, 1, 1), datetime(2024, 1, 2), datetime(2024, 1, 3)],
+    "E": [1.0, 2.0, 3.0],
+    "F": [1.0, 2.0, 3.0],
+    "G": [1.0, 2.0, 3.0],
+    "H": [1.0, 2.0, 3.0],
+})
+
+
+def no_filters(**filters):
+    return {**{col: [] for col in KEY_COLUMNS}, "date_range": None, **filters}
+
+
+def test_empty_selections_build_no_predicate():
+    assert build_filter_predicate(no_filters()) is None
+    # A half-picked date range doesn't filter either
+    assert build_filter_predicate(no_filters(date_range=(date(2024, 1, 1), None))) is None
+
+
+def test_empty_selections_are_skipped_in_the_predicate():
+    predicate = build_filter_predicate(no_filters(A=["A1"]))
+    assert FRAME.filter(predicate)["A"].to_list() == ["A1", "A1"]
+
+    predicate = build_filter_predicate(
+        no_filters(region=["North"], date_range=(datetime(2024, 1, 2), datetime(2024, 1, 3)))
+    )
+    assert FRAME.filter(predicate)["A"].to_list() == ["A2"]
+
+
+def test_lazy_source_filters_like_the_predicate():
+    source = LazyFrameSource(FRAME.lazy())
+
+    assert source.filter(no_filters()).equals(FRAME)
+    assert source.filter(no_filters(C=["C2"]))["region"].to_list() == ["South"]
+    assert source.keys() == [tuple(row) for row in FRAME.select(KEY_COLUMNS).sort(KEY_COLUMNS).iter_rows()]
+    assert source.date_range() == (datetime(2024, 1, 1), datetime(2024, 1, 3))
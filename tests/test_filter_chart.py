@@ -0,0 +1,311 @@
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import panel as pn
+import polars as pl
+import pytest
+from panel.io.state import set_curdoc
+
+from filter_chart import (
+    VIEW_BUILD_POOL, BackgroundBuild, ChartView, FilteredData, FilterSelectors, LiveHub, PartitionIndex,
+    RollupCube, TableView, append_rows, compact_arrays, generate_full_df, generate_series_frame,
+    raster_strokes,
+)
+from view_cache import ViewCache
+
+
+@pytest.fixture(scope="module")
+def source():
+    return PartitionIndex(generate_full_df(num_series=12, days=60))
+
+
+@pytest.fixture(scope="module")
+def rollups(source):
+    return RollupCube(source)
+
+
+def session(source, rollups, data_cache):
+    """The per-session objects of a Dashboard that read the shared data cache."""
+    selectors = FilterSelectors(source)
+    filtered_data = FilteredData(source, selectors, ViewCache(), data_cache, rollups=rollups)
+    return selectors, filtered_data, ChartView(filtered_data, selectors)
+
+
+def select_series(selectors, a_values):
+    for selector in (selectors.region_selector, selectors.C_selector, selectors.D_selector):
+        selector.value = [selector.options[0]]
+    selectors.A_selector.value = a_values
+
+
+def test_filter_change_during_build_does_not_poison_shared_cache(source, rollups, monkeypatch):
+    data_cache = ViewCache()
+    first_selectors, first_data, first_chart = session(source, rollups, data_cache)
+    second_selectors, second_data, second_chart = session(source, rollups, data_cache)
+    select_series(first_selectors, ['A1'])
+    select_series(second_selectors, ['A1'])
+
+    # Hold the first session's chart build on the pool until its user has clicked A2
+    started, release = threading.Event(), threading.Event()
+    build_chart_data = first_chart._timed_chart_data
+
+    def slow_build(*args):
+        started.set()
+        assert release.wait(10)
+        return build_chart_data(*args)
+
+    monkeypatch.setattr(first_chart, "_timed_chart_data", slow_build)
+    build = VIEW_BUILD_POOL.submit(first_chart.chart_data)
+    assert started.wait(10)
+    first_selectors.A_selector.value = ['A2']
+    release.set()
+    build.result(timeout=10)
+
+    assert set(second_data.frame()['A']) == {'A1'}
+    structure, series = second_chart.chart_data()
+    assert structure[0] == (('North', 'C1', 'D1', 'A1'),)
+    assert set(series['all']['series'].str.split(' | ').list.last()) == {'A1'}
+
+    # The first session now gets A2 rows under its new filter state
+    assert set(first_data.frame()['A']) == {'A2'}
+
+
+def test_cache_key_and_build_share_one_snapshot(source, rollups):
+    selectors, filtered_data, chart = session(source, rollups, ViewCache())
+    select_series(selectors, ['A1'])
+    filters = filtered_data.filters()
+    selectors.A_selector.value = ['A2']
+
+    assert set(filtered_data.frame(filters)['A']) == {'A1'}
+    assert filtered_data.key(filters) != filtered_data.key()
+
+
+def test_table_filters_sorts_and_pages_on_the_server(source, rollups):
+    selectors, filtered_data, _ = session(source, rollups, ViewCache())
+    select_series(selectors, ['A1', 'A2'])
+    table = TableView(filtered_data, selectors)
+    table.page_size.value = 25
+
+    table.sort_by.value = 'date'
+    table.descending.value = True
+    table.filter_column.value = 'A'
+    table.filter_value.value = 'A2'
+
+    expected = filtered_data.frame().filter(pl.col('A') == 'A2').sort('date', descending=True)
+    assert table.page.end == -(-len(expected) // 25)
+    assert table.table.value['A'].unique().tolist() == ['A2']
+    assert list(table.table.value['date']) == list(expected['date'].head(25))
+
+    table.page.value = 2
+    assert list(table.table.value['date']) == list(expected['date'].slice(25, 25))
+
+
+def test_table_page_change_slices_the_built_frame(source, rollups):
+    selectors, filtered_data, _ = session(source, rollups, ViewCache())
+    select_series(selectors, ['A1'])
+    table = TableView(filtered_data, selectors)
+    table.page_size.value = 25
+    built = table.table_frame()
+    table.show_first_page(built)
+
+    # Filters change, but the new frame hasn't been built yet: paging stays on the old one
+    selectors.A_selector.value = ['A2']
+    table.page.value = 2
+    assert list(table.table.value['A'].unique()) == ['A1']
+    assert list(table.table.value['date']) == list(built['date'].slice(25, 25))
+
+
+def test_raster_strokes_draw_an_axis_as_one_line():
+    parts = [
+        (np.array([1, 2]), np.array([5.0, 6.0])),
+        (np.array([1]), np.array([7.0])),
+        (np.array([], int), np.array([])),  # a deselected series draws nothing
+    ]
+
+    x, y = raster_strokes(parts, "line")
+    assert x.tolist() == [1, 2, 2, 1, 1]
+    np.testing.assert_array_equal(y, [5.0, 6.0, np.nan, 7.0, np.nan])
+
+    x, y = raster_strokes(parts, "bar")
+    assert x.tolist() == [1, 1, 1, 2, 2, 2, 1, 1, 1]
+    np.testing.assert_array_equal(y, [0, 5.0, np.nan, 0, 6.0, np.nan, 0, 7.0, np.nan])
+
+
+def test_zooming_the_combined_chart_reads_a_finer_rollup_level():
+    long_source = PartitionIndex(generate_full_df(num_series=2, days=3 * 365))
+    selectors, filtered_data, chart = session(long_source, RollupCube(long_source), ViewCache())
+    select_series(selectors, ['A1'])
+    filters = filtered_data.filters()
+    assert chart.chart_window(filters, None)[0] != "daily"
+
+    first_date = filters['date_range'][0]
+    start, end = first_date + timedelta(days=100), first_date + timedelta(days=160)
+    chart.zoom_to(x_range=(np.datetime64(start), np.datetime64(end)))
+    zoom = chart.chart_state()[3]
+    assert zoom == (start, end)
+    level, (window_start, window_end) = chart.chart_window(filters, zoom)
+    assert (level, window_start, window_end) == ("daily", start - (end - start), end + (end - start))
+    structure, series = chart.chart_data()
+    assert series['all']['date'].dt.date().min() >= window_start
+
+    # Panning inside the rows read keeps them; a new date range filter drops the zoom
+    pan = timedelta(days=5)
+    chart.zoom_to(x_range=(np.datetime64(start + pan), np.datetime64(end + pan)))
+    assert chart.chart_state()[3] == zoom
+    selectors.date_range_picker.value = (start, filters['date_range'][1])
+    assert chart.chart_state()[3] is None
+
+
+def test_one_notification_per_cascading_selection(source):
+    notifications = []
+    selectors = FilterSelectors(source, on_change=lambda: notifications.append(selectors.get_filters()))
+    select_series(selectors, ['A1'])
+    assert len(notifications) == 4
+
+    # Clearing the region clears C, D and A below it, still with a single notification
+    notifications.clear()
+    selectors.region_selector.value = []
+    assert len(notifications) == 1
+    assert notifications[0]['C'] == notifications[0]['D'] == notifications[0]['A'] == []
+    assert selectors.A_selector.options == selectors.hierarchy.options('A', selectors.get_filters())
+
+
+class SessionDocument:
+    """Stands in for a server session's Document: next-tick callbacks wait for run_callbacks()."""
+    session_context = SimpleNamespace(request=SimpleNamespace(arguments={}))
+
+    def __init__(self):
+        self.callbacks = []
+        self.scheduled = threading.Semaphore(0)
+
+    def add_next_tick_callback(self, callback):
+        self.callbacks.append(callback)
+        self.scheduled.release()
+
+    def run_callbacks(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def test_background_build_drops_superseded_results():
+    view = pn.Column("content")
+    builder = BackgroundBuild(view, "chart")
+    doc, applied = SessionDocument(), []
+
+    with set_curdoc(doc):
+        builder.submit(lambda: "first", applied.append)
+        assert view.loading
+        assert doc.scheduled.acquire(timeout=10)
+        # A new build is submitted before the first one's result reaches the event loop
+        builder.submit(lambda: "second", applied.append)
+        assert doc.scheduled.acquire(timeout=10)
+    doc.run_callbacks()
+
+    assert applied == ["second"]
+    assert not view.loading
+
+
+def test_background_build_failure_shows_an_alert_above_the_last_content():
+    view = pn.Column("content")
+    builder = BackgroundBuild(view, "table")
+    doc = SessionDocument()
+
+    def fail():
+        raise RuntimeError("scan failed")
+
+    with set_curdoc(doc):
+        builder.submit(fail, lambda result: None)
+        assert doc.scheduled.acquire(timeout=10)
+    doc.run_callbacks()
+
+    alert, content = view.objects
+    assert isinstance(alert, pn.pane.Alert) and "scan failed" in alert.object
+    assert content.object == "content"
+    assert not view.loading
+
+    # The next successful build clears it
+    with set_curdoc(doc):
+        builder.submit(lambda: "rows", lambda result: None)
+        assert doc.scheduled.acquire(timeout=10)
+    doc.run_callbacks()
+    assert [pane.object for pane in view.objects] == ["content"]
+
+
+def test_compact_arrays_send_epoch_days_and_float32_values():
+    dates = np.array(['1970-01-02', '2024-01-01'], dtype='datetime64[us]')
+    shared_dates = {}
+    first = compact_arrays({'date': dates, 'E': np.array([1.5, 2.5])}, shared_dates)
+    second = compact_arrays({'date': dates, 'G': np.array([3.0, 4.0])}, shared_dates)
+
+    assert first['date'].tolist() == [1, 19723]
+    assert first['E'].dtype == np.float32 and first['E'].tolist() == [1.5, 2.5]
+    # Series that shared a date array share its compact copy
+    assert second['date'] is first['date']
+
+
+def test_compact_wire_chart_data_matches_the_full_encoding(source, rollups):
+    selectors, filtered_data, chart = session(source, rollups, ViewCache())
+    select_series(selectors, ['A1', 'A2'])
+    compact_chart = ChartView(filtered_data, selectors, compact_wire=True)
+
+    full, compact = chart.chart_data()[1]['all'], compact_chart.chart_data()[1]['all']
+    assert compact.schema == {'series': pl.String, 'date': pl.Int64, 'value': pl.Float32}
+    assert compact['series'].equals(full['series'])
+    assert compact['date'].equals(full['date'].dt.epoch('d').cast(pl.Int64))
+    assert np.allclose(compact['value'], full['value'], rtol=1e-6)
+
+
+def live_batch(source, days=1, seed=0):
+    """The next `days` days of rows for every series of `source`, G/H as daily increments."""
+    next_date = source.date_range()[1] + timedelta(days=1)
+    return generate_series_frame(source.keys(), days, np.random.default_rng(seed), next_date, cumulate=False)
+
+
+def test_live_hub_appends_each_batch_and_hands_it_to_subscribers():
+    source = PartitionIndex(generate_full_df(num_series=2, days=30))
+    rollups = RollupCube(source)
+    hub = LiveHub(source, rollups, feed=None)
+    received = []
+
+    def failing(rows):
+        raise RuntimeError("session gone")
+
+    hub.subscribe(failing)
+    hub.subscribe(received.append)
+    key = source.keys()[0]
+    last = source.last_row(key)
+    batch = live_batch(source)
+    hub.publish(batch)
+
+    stored, = received
+    assert stored.height == 2
+    assert source.last_row(key)["date"] == stored["date"].max() == batch["date"].max()
+    # G/H arrive as increments and are stored cumulated
+    increment = batch.filter(pl.col("A") == key[3])["G"].item()
+    assert source.last_row(key)["G"] == pytest.approx(last["G"] + increment)
+    assert rollups.date_range[1] == batch["date"].max().date()
+
+    hub.unsubscribe(received.append)
+    hub.publish(live_batch(source, seed=1))
+    assert len(received) == 1
+
+
+def test_live_chart_buffers_keep_the_latest_window():
+    live_source = PartitionIndex(generate_full_df(num_series=2, days=30))
+    selectors = FilterSelectors(live_source)
+    filtered_data = FilteredData(live_source, selectors)
+    chart = ChartView(filtered_data, selectors, live_window=10)
+    select_series(selectors, [key[3] for key in live_source.keys()])
+    chart.apply_chart_data(chart.chart_data())
+
+    batch = live_batch(live_source, days=3)
+    changed = append_rows(live_source, filtered_data.rollups, batch)
+    assert chart.stream_rows(live_source.appended_rows(changed)) == 6
+
+    for key in live_source.keys():
+        data = chart._pipes[(key, 'G')].data
+        assert len(data) == 10
+        assert data['date'].iloc[-1] == batch["date"].max()
+        assert data['G'].iloc[-1] == live_source.last_row(key)['G']
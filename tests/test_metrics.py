@@ -0,0 +1,75 @@
+import asyncio
+
+import numpy as np
+import pytest
+from bokeh.document import Document
+from bokeh.models import ColumnDataSource
+from bokeh.protocol import Protocol
+from tornado.locks import Lock
+
+from metrics import Metrics, instrument_websocket, message_bytes, payload_view
+
+
+def test_histogram_buckets_and_quantiles():
+    metrics = Metrics()
+    for value in range(1, 101):
+        metrics.observe("chart", "build", value)
+
+    row, = metrics.snapshot()
+    assert (row["view"], row["step"], row["unit"], row["count"]) == ("chart", "build", "ms", 100)
+    assert row["mean"] == pytest.approx(50.5)
+    assert row["p50"] == pytest.approx(50.5)
+    assert 98 < row["p99"] <= 100
+
+
+def test_text_export_has_cumulative_buckets_per_view_and_step():
+    metrics = Metrics()
+    metrics.observe("table", "filter_sort", 3)
+    metrics.observe("table", "filter_sort", 30)
+    metrics.observe("chart", "PATCH-DOC", 5000, unit="bytes")
+
+    lines = metrics.render_text().splitlines()
+    assert "# TYPE coolview_span_ms histogram" in lines
+    assert 'coolview_span_ms_bucket{view="table",step="filter_sort",le="5"} 1' in lines
+    assert 'coolview_span_ms_bucket{view="table",step="filter_sort",le="50"} 2' in lines
+    assert 'coolview_span_ms_bucket{view="table",step="filter_sort",le="+Inf"} 2' in lines
+    assert 'coolview_span_ms_count{view="table",step="filter_sort"} 2' in lines
+    assert 'coolview_payload_bytes_sum{view="chart",step="PATCH-DOC"} 5000.000' in lines
+
+
+class RecordingSocket:
+    def __init__(self):
+        self.sent = 0
+        self.write_lock = Lock()
+
+    async def write_message(self, message, binary=False, locked=True):
+        self.sent += len(message)
+
+
+def test_websocket_messages_are_sized_per_view(monkeypatch):
+    monkeypatch.setattr(Protocol, "create", Protocol.create)  # restored after the test
+    metrics = Metrics()
+    instrument_websocket(metrics)
+
+    doc = Document()
+    source = ColumnDataSource({"x": np.zeros(1000)})
+    doc.add_root(source)
+    events = []
+    doc.on_change(events.append)
+    source.data = {"x": np.ones(1000)}
+
+    with payload_view("chart"):
+        message = Protocol().create("PATCH-DOC", events)
+    Protocol().create("ACK")
+
+    rows = {(row["view"], row["step"]): row for row in metrics.snapshot() if row["unit"] == "bytes"}
+    assert set(rows) == {("chart", "PATCH-DOC"), ("websocket", "ACK")}
+
+    # The recorded size is what sending the message writes, 8 kB of float64 included
+    async def send():
+        socket = RecordingSocket()
+        return await message.send(socket), socket.sent
+
+    reported, written = asyncio.run(send())
+    assert reported == written == message_bytes(message)
+    assert rows[("chart", "PATCH-DOC")]["mean"] == written > 8000
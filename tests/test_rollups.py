@@ -0,0 +1,76 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from data_index import KEY_COLUMNS, PartitionIndex
+from data_sources import LazyFrameSource
+from rollups import RollupCube
+
+KEYS = [("North", "C1", "D1", "A1"), ("North", "C1", "D1", "A2"), ("South", "C2", "D2", "A1")]
+START = datetime(2024, 1, 1)
+
+
+def random_rows(days, start, seed):
+    rng = np.random.default_rng(seed)
+    dates = [start + timedelta(days=day) for day in range(days)]
+    return pl.DataFrame({
+        **{col: [key[i] for key in KEYS for _ in dates] for i, col in enumerate(KEY_COLUMNS)},
+        "date": dates * len(KEYS),
+        **{col: rng.uniform(1, 100, days * len(KEYS)) for col in ["E", "F", "G", "H"]},
+    })
+
+
+def no_filters():
+    return {**{col: [] for col in KEY_COLUMNS}, "date_range": None}
+
+
+def test_update_after_appends_matches_a_full_rebuild():
+    # Appends land mid-week, mid-month and mid-quarter, so stored buckets are merged
+    source = PartitionIndex(random_rows(45, START, seed=1))
+    cube = RollupCube(source)
+    for day in range(45, 100, 11):
+        cube.update(source.append(random_rows(11, START + timedelta(days=day), seed=day)))
+
+    rebuilt = RollupCube(PartitionIndex(source.filter(no_filters())))
+    for level, index in cube.levels.items():
+        assert_frame_equal(
+            index.filter(no_filters()).sort(KEY_COLUMNS + ["date"]),
+            rebuilt.levels[level].filter(no_filters()).sort(KEY_COLUMNS + ["date"]),
+            check_exact=False,
+        )
+    assert cube.date_range == (date(2024, 1, 1), date(2024, 4, 9))
+
+
+def test_update_bumps_the_versions_of_changed_series_only():
+    source = PartitionIndex(random_rows(30, START, seed=1))
+    cube = RollupCube(source)
+    before = {level: cube.version(level, no_filters()) for level in cube.levels}
+
+    new_rows = random_rows(1, START + timedelta(days=30), seed=2).filter(pl.col("A") == "A2")
+    cube.update(source.append(new_rows))
+
+    for level in cube.levels:
+        assert before[level] == ()
+        assert cube.version(level, no_filters()) == ((KEYS[1], 1),)
+
+
+def test_level_for_picks_the_coarsest_level_that_fills_the_width():
+    cube = RollupCube(PartitionIndex(random_rows(400, START, seed=1)))
+
+    assert cube.level_for(None, 16 * 4) == "quarterly"
+    assert cube.level_for(None, 16 * 50) == "weekly"
+    assert cube.level_for((date(2024, 1, 1), date(2024, 1, 31)), 800) == "daily"
+
+
+def test_scanned_source_rollups_match_the_in_memory_ones():
+    # Rows out of order, as a scan of several files may read them
+    rows = random_rows(120, START, seed=1)
+    scanned = RollupCube(LazyFrameSource(rows.sample(fraction=1.0, shuffle=True, seed=2).lazy()))
+    in_memory = RollupCube(PartitionIndex(rows))
+
+    for level, index in in_memory.levels.items():
+        assert_frame_equal(
+            scanned.levels[level].filter(no_filters()), index.filter(no_filters()), check_exact=False
+        )
@@ -0,0 +1,64 @@
+import numpy as np
+
+from view_cache import ViewCache, estimate_size
+
+
+def array(nbytes):
+    return np.zeros(nbytes, dtype=np.uint8)
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ViewCache(max_bytes=300)
+    for key in "abc":
+        cache.put(key, array(100))
+    cache.get("a")  # "b" is now the least recently used
+
+    cache.put("d", array(100))
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    assert cache.stats()["bytes"] == 300
+
+
+def test_entries_are_evicted_until_the_byte_budget_fits():
+    cache = ViewCache(max_bytes=300)
+    for key in "abc":
+        cache.put(key, array(100))
+
+    cache.put("big", array(250))
+
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == 250
+    # A value larger than the whole budget is returned but not cached
+    assert cache.put("huge", array(301)).nbytes == 301
+    assert cache.get("huge") is None
+    assert cache.get("big") is not None
+
+
+def test_replacing_a_key_replaces_its_size():
+    cache = ViewCache(max_bytes=300)
+    cache.put("a", array(100))
+    cache.put("a", array(200))
+
+    assert cache.stats()["bytes"] == 200
+    assert cache.stats()["entries"] == 1
+
+
+def test_get_or_build_builds_once_and_sizes_with_nbytes():
+    cache = ViewCache(max_bytes=300)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return object()  # can't be measured, like a built chart
+
+    first = cache.get_or_build("view", build, nbytes=lambda built: 120)
+    assert cache.get_or_build("view", build, nbytes=lambda built: 120) is first
+    assert len(builds) == 1
+    assert cache.stats()["bytes"] == 120
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_estimate_size_sums_containers():
+    assert estimate_size({"a": array(10), "b": [array(5), array(5)]}) == 20
+    assert estimate_size(object()) == 0